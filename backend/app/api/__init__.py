@@ -1,3 +1,3 @@
-from app.api import auth, ems
+from app.api import auth, ems, exports
 
-__all__ = ["auth", "ems"]
+__all__ = ["auth", "ems", "exports"]
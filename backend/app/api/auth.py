@@ -1,10 +1,13 @@
 from datetime import date
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_current_employee, get_db
-from app.core.security import create_access_token, hash_password, verify_password
+from app.core.dependencies import CurrentEmployee, get_current_employee, get_db
+from app.core.etag import bump_table_versions
+from app.core.metrics import LOGINS
+from app.core.security import create_access_token, hash_password_async, verify_password_async
 from app.models.employee import Employee
 from app.schemas import EmployeeCreate, EmployeeOut, LoginRequest, LoginResponse
 
@@ -12,13 +15,13 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
 @router.post("/register", response_model=EmployeeOut)
-def register(payload: EmployeeCreate, db: Session = Depends(get_db)):
-    if db.query(Employee).filter(Employee.email == payload.email).first():
+async def register(payload: EmployeeCreate, db: AsyncSession = Depends(get_db)):
+    if await db.scalar(select(Employee.id).where(Employee.email == payload.email)):
         raise HTTPException(status_code=400, detail="Employee email already exists")
 
     employee = Employee(
         email=payload.email,
-        password_hash=hash_password(payload.password),
+        password_hash=await hash_password_async(payload.password),
         full_name=payload.full_name,
         title=payload.title,
         department=payload.department,
@@ -27,21 +30,25 @@ def register(payload: EmployeeCreate, db: Session = Depends(get_db)):
         joined_on=date.today(),
     )
     db.add(employee)
-    db.commit()
-    db.refresh(employee)
+    await bump_table_versions(db, "employees")
+    await db.commit()
+    await db.refresh(employee)
     return employee
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    employee = db.query(Employee).filter(Employee.email == payload.email).first()
-    if not employee or not verify_password(payload.password, employee.password_hash):
+async def login(payload: LoginRequest, db: AsyncSession = Depends(get_db)):
+    employee = await db.scalar(select(Employee).where(Employee.email == payload.email))
+    if not employee or not await verify_password_async(payload.password, employee.password_hash):
+        LOGINS.labels("failure").inc()
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
+    LOGINS.labels("success").inc()
+
     token = create_access_token({"sub": employee.email, "role": employee.role, "employee_id": employee.id})
     return {"access_token": token, "role": employee.role, "employee": employee}
 
 
 @router.get("/me", response_model=EmployeeOut)
-def me(current_employee: Employee = Depends(get_current_employee)):
+async def me(current_employee: CurrentEmployee = Depends(get_current_employee)):
     return current_employee
@@ -1,13 +1,48 @@
+import csv
+import io
+import json
 import os
+from collections import defaultdict
 from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
-
-from app.core.dependencies import get_current_employee, get_db
-from app.core.security import hash_password
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import and_, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.attendance_journal import attendance_journal, merge_pending
+from app.core.cache import TTLCache
+from app.core.database import pool_status, replica_router
+from app.core.dependencies import (
+    PRINCIPALS_VERSION,
+    CurrentEmployee,
+    assert_admin,
+    get_current_employee,
+    get_current_reader,
+    get_db,
+    get_read_db,
+    invalidate_principal,
+    principal_cache,
+)
+from app.core.etag import bump_table_versions, conditional_get, table_versions
+from app.core.leave_balance import (
+    accrued_days,
+    change_leave_status,
+    leave_balance,
+    leave_cost,
+    record_leave,
+    refund_holiday,
+    reserve_leave,
+)
+from app.core.pagination import DateRange, PageParams, date_range, page_params, paginate
+from app.core.rollups import record_time_logs
+from app.core.search import query_terms, search_employees, search_time_logs
+from app.core.security import hash_password_async, hash_passwords_async
+from app.core.upsert import UPSERT_RETURNING_DIALECTS, insert_or_update
 from app.models.attendance import Attendance
 from app.models.employee import Employee
 from app.models.holiday import CompanyHoliday
@@ -15,21 +50,58 @@ from app.models.leave import LeaveRequest
 from app.models.project import Project
 from app.models.project_member import ProjectMember
 from app.models.time_log import TimeLog
+from app.models.time_log_summary import TimeLogDailySummary
 from app.schemas import (
-    AttendanceMarkRequest,
     AdminEmployeeCreate,
+    AdminEmployeeOut,
     AdminEmployeeUpdate,
     AdminLeaveCreate,
+    AttendanceMarkRequest,
+    AttendanceOut,
+    CalendarDayOut,
+    DashboardOut,
+    DiagnosticsOut,
+    EmployeeImportResult,
+    EmployeeImportRow,
+    EmployeeLabelOut,
     HolidayCreate,
+    HolidayOut,
+    HoursReportRow,
+    LeaveBalanceOut,
+    LeaveListItemOut,
     LeaveRequestCreate,
+    LeaveRequestOut,
     LeaveStatusUpdate,
+    ProfileOut,
     ProjectCreate,
     ProjectMemberAdd,
+    ProjectMemberOut,
+    ProjectOut,
+    ProjectWithMembersOut,
+    SearchHitOut,
+    TeamMemberOut,
+    TimeLogBatchCreate,
+    TimeLogBatchResult,
     TimeLogCreate,
+    TimeLogListItemOut,
+    TimeLogOut,
 )
 
 router = APIRouter(prefix="/ems", tags=["Employee Management"])
 
+APP_TIMEZONE = ZoneInfo(os.getenv("APP_TIMEZONE", "Asia/Kolkata"))
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "300"))
+
+BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", "50000"))
+BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "500"))
+IN_CLAUSE_CHUNK_SIZE = 1000
+MAX_HOURS_PER_DAY = 24
+MAX_TEAM_DEPTH = 20
+MAX_CALENDAR_DAYS = 366
+
+dashboard_cache = TTLCache(maxsize=8, ttl=DASHBOARD_CACHE_TTL_SECONDS)
+DASHBOARD_TABLES = ("leave_requests", "holidays", "employees")
+
 
 def _employee_label(employee: Employee) -> dict:
     return {
@@ -40,54 +112,104 @@ def _employee_label(employee: Employee) -> dict:
     }
 
 
-def _assert_admin(employee: Employee) -> None:
-    if employee.role != "admin":
-        raise HTTPException(status_code=403, detail="Only admins can perform this action")
-
+def _leave_summary(leave: LeaveRequest, emp: Employee) -> dict:
+    return {
+        "leave_id": leave.id,
+        "employee": emp.full_name,
+        "reason": leave.reason,
+        "start_date": leave.start_date,
+        "end_date": leave.end_date,
+    }
 
-@router.get("/dashboard")
-def dashboard(current_employee: Employee = Depends(get_current_employee), db: Session = Depends(get_db)):
-    app_timezone = os.getenv("APP_TIMEZONE", "Asia/Kolkata")
-    today = datetime.now(ZoneInfo(app_timezone)).date()
 
-    today_leaves = (
-        db.query(LeaveRequest, Employee)
+def _approved_leaves_overlapping(start: date, end: date):
+    return (
+        select(LeaveRequest, Employee)
         .join(Employee, LeaveRequest.employee_id == Employee.id)
-        .filter(
+        .where(
             LeaveRequest.status == "approved",
-            LeaveRequest.start_date <= today,
-            LeaveRequest.end_date >= today,
+            LeaveRequest.start_date <= end,
+            LeaveRequest.end_date >= start,
         )
-        .all()
     )
 
+
+def _assert_leave_length(start: date, end: date) -> None:
+    if (end - start).days + 1 > MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"Leave requests are limited to {MAX_CALENDAR_DAYS} days")
+
+
+def _local_today() -> date:
+    return datetime.now(APP_TIMEZONE).date()
+
+
+async def _org_dashboard(db: AsyncSession, today: date) -> dict:
+    """Organisation-wide dashboard sections, identical for every employee on a given day.
+
+    The cache key carries the version stamps of every table the snapshot reads,
+    so a write on any worker retires the cached copy on all of them.
+    """
+    key = (today, APP_TIMEZONE.key, *await table_versions(db, *DASHBOARD_TABLES))
+    snapshot = dashboard_cache.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    today_leaves = (await db.execute(_approved_leaves_overlapping(today, today))).all()
+
     upcoming_leaves = (
-        db.query(LeaveRequest, Employee)
-        .join(Employee, LeaveRequest.employee_id == Employee.id)
-        .filter(
-            LeaveRequest.status == "approved",
-            LeaveRequest.start_date > today,
-            LeaveRequest.start_date <= today + timedelta(days=14),
+        await db.execute(
+            select(LeaveRequest, Employee)
+            .join(Employee, LeaveRequest.employee_id == Employee.id)
+            .where(
+                LeaveRequest.status == "approved",
+                LeaveRequest.start_date > today,
+                LeaveRequest.start_date <= today + timedelta(days=14),
+            )
+            .order_by(LeaveRequest.start_date.asc())
         )
-        .order_by(LeaveRequest.start_date.asc())
-        .all()
-    )
+    ).all()
 
     holidays = (
-        db.query(CompanyHoliday)
-        .filter(CompanyHoliday.holiday_date >= today)
-        .order_by(CompanyHoliday.holiday_date.asc())
-        .limit(5)
-        .all()
-    )
+        await db.scalars(
+            select(CompanyHoliday)
+            .where(CompanyHoliday.holiday_date >= today)
+            .order_by(CompanyHoliday.holiday_date.asc())
+            .limit(5)
+        )
+    ).all()
+
+    snapshot = {
+        "today_leaves": [_leave_summary(leave, emp) for leave, emp in today_leaves],
+        "upcoming_leaves": [_leave_summary(leave, emp) for leave, emp in upcoming_leaves],
+        "upcoming_holidays": [
+            {
+                "id": holiday.id,
+                "name": holiday.name,
+                "holiday_date": holiday.holiday_date,
+                "description": holiday.description,
+            }
+            for holiday in holidays
+        ],
+    }
+    dashboard_cache.set(key, snapshot)
+    return snapshot
+
+
+@router.get("/dashboard", response_model=DashboardOut)
+async def dashboard(
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
+):
+    snapshot = await _org_dashboard(db, _local_today())
 
     my_projects = (
-        db.query(Project)
-        .join(ProjectMember, ProjectMember.project_id == Project.id)
-        .filter(ProjectMember.employee_id == current_employee.id)
-        .order_by(Project.name.asc())
-        .all()
-    )
+        await db.scalars(
+            select(Project)
+            .join(ProjectMember, ProjectMember.project_id == Project.id)
+            .where(ProjectMember.employee_id == current_employee.id)
+            .order_by(Project.name.asc())
+        )
+    ).all()
 
     return {
         "employee": {
@@ -97,73 +219,52 @@ def dashboard(current_employee: Employee = Depends(get_current_employee), db: Se
             "department": current_employee.department,
             "role": current_employee.role,
         },
-        "today_leaves": [
-            {
-                "leave_id": leave.id,
-                "employee": emp.full_name,
-                "reason": leave.reason,
-                "start_date": leave.start_date,
-                "end_date": leave.end_date,
-            }
-            for leave, emp in today_leaves
-        ],
-        "upcoming_leaves": [
-            {
-                "leave_id": leave.id,
-                "employee": emp.full_name,
-                "reason": leave.reason,
-                "start_date": leave.start_date,
-                "end_date": leave.end_date,
-            }
-            for leave, emp in upcoming_leaves
-        ],
-        "upcoming_holidays": holidays,
+        **snapshot,
         "my_projects": my_projects,
     }
 
 
-@router.get("/employees")
-def list_employees(current_employee: Employee = Depends(get_current_employee), db: Session = Depends(get_db)):
-    employees = db.query(Employee).order_by(Employee.full_name.asc()).all()
+@router.get("/employees", response_model=list[EmployeeLabelOut])
+async def list_employees(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
+):
+    if not_modified := await conditional_get(db, request, response, "employees"):
+        return not_modified
+    employees = await paginate(db, select(Employee), [Employee.full_name, Employee.id], page, response)
     return [_employee_label(emp) for emp in employees]
 
 
-@router.get("/admin/employees")
-def admin_list_employees(current_employee: Employee = Depends(get_current_employee), db: Session = Depends(get_db)):
-    _assert_admin(current_employee)
-    employees = db.query(Employee).order_by(Employee.full_name.asc()).all()
-    return [
-        {
-            "id": emp.id,
-            "email": emp.email,
-            "full_name": emp.full_name,
-            "title": emp.title,
-            "department": emp.department,
-            "role": emp.role,
-            "manager_id": emp.manager_id,
-            "joined_on": emp.joined_on,
-            "is_active": emp.is_active,
-        }
-        for emp in employees
-    ]
+@router.get("/admin/employees", response_model=list[AdminEmployeeOut])
+async def admin_list_employees(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
+):
+    assert_admin(current_employee)
+    return await paginate(db, select(Employee), [Employee.full_name, Employee.id], page, response)
 
 
-@router.post("/admin/employees")
-def admin_create_employee(
+@router.post("/admin/employees", response_model=AdminEmployeeOut)
+async def admin_create_employee(
     payload: AdminEmployeeCreate,
-    current_employee: Employee = Depends(get_current_employee),
-    db: Session = Depends(get_db),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
 ):
-    _assert_admin(current_employee)
-    if db.query(Employee).filter(Employee.email == payload.email).first():
+    assert_admin(current_employee)
+    if await db.scalar(select(Employee.id).where(Employee.email == payload.email)):
         raise HTTPException(status_code=400, detail="Employee email already exists")
 
-    if payload.manager_id and not db.query(Employee).filter(Employee.id == payload.manager_id).first():
+    if payload.manager_id and not await db.get(Employee, payload.manager_id):
         raise HTTPException(status_code=404, detail="Manager not found")
 
     employee = Employee(
         email=payload.email,
-        password_hash=hash_password(payload.password),
+        password_hash=await hash_password_async(payload.password),
         full_name=payload.full_name,
         title=payload.title,
         department=payload.department,
@@ -173,20 +274,218 @@ def admin_create_employee(
         is_active=payload.is_active,
     )
     db.add(employee)
-    db.commit()
-    db.refresh(employee)
+    await bump_table_versions(db, "employees")
+    await db.commit()
+    await db.refresh(employee)
     return employee
 
 
-@router.put("/admin/employees/{employee_id}")
-def admin_update_employee(
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+async def _employee_ids_by_email(db: AsyncSession, emails: set[str]) -> dict[str, int]:
+    ids_by_email = {}
+    for chunk in _chunks(sorted(emails), IN_CLAUSE_CHUNK_SIZE):
+        rows = await db.execute(select(Employee.email, Employee.id).where(Employee.email.in_(chunk)))
+        ids_by_email.update(rows.all())
+    return ids_by_email
+
+
+def _iter_import_records(upload: UploadFile):
+    """Yield ``(record, error)`` for each data row of a CSV or NDJSON upload without loading it whole."""
+    filename = (upload.filename or "").lower()
+    is_ndjson = filename.endswith((".ndjson", ".jsonl")) or upload.content_type in {
+        "application/x-ndjson",
+        "application/jsonl",
+    }
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+
+    if is_ndjson:
+        for line in text:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                yield None, "Invalid JSON"
+                continue
+            yield (record, None) if isinstance(record, dict) else (None, "Row must be a JSON object")
+        return
+
+    for record in csv.DictReader(text):
+        yield {
+            key.strip(): value.strip()
+            for key, value in record.items()
+            if key and isinstance(value, str) and value.strip()
+        }, None
+
+
+def _parse_import(upload: UploadFile) -> tuple[list, list[dict], set[str]]:
+    """Validate every upload row; returns ``(rows, errors, emails)`` with rows as ``(row_number, row)``."""
+    errors = []
+    rows = []
+    file_emails = set()
+
+    for row_number, (record, error) in enumerate(_iter_import_records(upload), start=1):
+        if row_number > BULK_IMPORT_MAX_ROWS:
+            raise HTTPException(status_code=413, detail=f"Imports are limited to {BULK_IMPORT_MAX_ROWS} rows")
+        if error is None:
+            try:
+                row = EmployeeImportRow.model_validate(record)
+            except ValidationError as exc:
+                error = "; ".join(f"{'.'.join(map(str, item['loc']))}: {item['msg']}" for item in exc.errors())
+        if error is None and row.email in file_emails:
+            error = "Duplicate email in file"
+        if error is None and row.manager_email == row.email:
+            error = "Employee cannot be their own manager"
+        if error:
+            errors.append({"row": row_number, "email": (record or {}).get("email"), "detail": error})
+            continue
+        file_emails.add(row.email)
+        rows.append((row_number, row))
+
+    return rows, errors, file_emails
+
+
+@router.post("/admin/employees/bulk", response_model=EmployeeImportResult)
+async def admin_bulk_create_employees(
+    file: UploadFile = File(...),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
+):
+    assert_admin(current_employee)
+    # Parsing and validating a large upload is CPU-bound; keep it off the event loop.
+    rows, errors, file_emails = await run_in_threadpool(_parse_import, file)
+
+    existing_emails = set()
+    for chunk in _chunks(sorted(file_emails), IN_CLAUSE_CHUNK_SIZE):
+        existing_emails.update(await db.scalars(select(Employee.email).where(Employee.email.in_(chunk))))
+
+    known_manager_ids = set()
+    manager_ids = sorted({row.manager_id for _, row in rows if row.manager_id})
+    for chunk in _chunks(manager_ids, IN_CLAUSE_CHUNK_SIZE):
+        known_manager_ids.update(await db.scalars(select(Employee.id).where(Employee.id.in_(chunk))))
+
+    manager_emails = {row.manager_email for _, row in rows if row.manager_email}
+    existing_managers = await _employee_ids_by_email(db, manager_emails)
+
+    pending = {}
+    for row_number, row in rows:
+        if row.email in existing_emails:
+            errors.append({"row": row_number, "email": row.email, "detail": "Employee email already exists"})
+        elif row.manager_id and row.manager_id not in known_manager_ids:
+            errors.append({"row": row_number, "email": row.email, "detail": "Manager not found"})
+        else:
+            pending[row.email] = (row_number, row)
+
+    # Rows pointing at a manager elsewhere in the file only succeed if that manager row does.
+    changed = True
+    while changed:
+        changed = False
+        for email, (row_number, row) in list(pending.items()):
+            manager_email = row.manager_email
+            if manager_email and manager_email not in existing_managers and manager_email not in pending:
+                errors.append({"row": row_number, "email": email, "detail": "Manager not found"})
+                del pending[email]
+                changed = True
+
+    # Insert managers before their reports so every row is stored with its manager id.
+    levels = []
+    placed = set(existing_managers)
+    unplaced = dict(pending)
+    while unplaced:
+        level = [
+            email for email, (_, row) in unplaced.items() if not row.manager_email or row.manager_email in placed
+        ]
+        if not level:
+            break
+        levels.append(level)
+        placed.update(level)
+        for email in level:
+            del unplaced[email]
+    for email, (row_number, _) in unplaced.items():
+        errors.append({"row": row_number, "email": email, "detail": "Circular manager reference in file"})
+
+    accepted = [pending[email][1] for level in levels for email in level]
+    password_hashes = dict(
+        zip((row.email for row in accepted), await hash_passwords_async([row.password for row in accepted]))
+    )
+    joined_on = date.today()
+    manager_ids = dict(existing_managers)
+    referenced_managers = {row.manager_email for row in accepted if row.manager_email}
+    created_emails = set()
+
+    for level in levels:
+        values = []
+        for email in level:
+            row_number, row = pending[email]
+            if row.manager_email and row.manager_email not in manager_ids:
+                manager_row = pending[row.manager_email][0]
+                errors.append(
+                    {"row": row_number, "email": email, "detail": f"Manager in row {manager_row} was not created"}
+                )
+                continue
+            values.append(
+                {
+                    "email": row.email,
+                    "password_hash": password_hashes[email],
+                    "full_name": row.full_name,
+                    "title": row.title,
+                    "department": row.department,
+                    "role": row.role,
+                    "manager_id": row.manager_id or manager_ids.get(row.manager_email),
+                    "joined_on": joined_on,
+                    "is_active": row.is_active,
+                }
+            )
+
+        level_created = set()
+        for batch in _chunks(values, BULK_INSERT_BATCH_SIZE):
+            try:
+                await db.execute(insert(Employee), batch)
+                await db.commit()
+                level_created.update(item["email"] for item in batch)
+                continue
+            except IntegrityError:
+                await db.rollback()
+            # Something changed since validation; retry row by row to find the rows at fault.
+            for item in batch:
+                try:
+                    await db.execute(insert(Employee), [item])
+                    await db.commit()
+                except IntegrityError as exc:
+                    await db.rollback()
+                    row_number = pending[item["email"]][0]
+                    errors.append({"row": row_number, "email": item["email"], "detail": f"Insert failed: {exc.orig}"})
+                    continue
+                level_created.add(item["email"])
+
+        created_emails.update(level_created)
+        manager_ids.update(await _employee_ids_by_email(db, level_created & referenced_managers))
+
+    if created_emails:
+        await bump_table_versions(db, "employees")
+        await db.commit()
+
+    errors.sort(key=lambda item: item["row"])
+    return {
+        "created": len(created_emails),
+        "failed": len(errors),
+        "errors": errors,
+    }
+
+
+@router.put("/admin/employees/{employee_id}", response_model=AdminEmployeeOut)
+async def admin_update_employee(
     employee_id: int,
     payload: AdminEmployeeUpdate,
-    current_employee: Employee = Depends(get_current_employee),
-    db: Session = Depends(get_db),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
 ):
-    _assert_admin(current_employee)
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    assert_admin(current_employee)
+    employee = await db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
 
@@ -194,37 +493,50 @@ def admin_update_employee(
 
     if changes.get("manager_id") == employee_id:
         raise HTTPException(status_code=400, detail="Employee cannot be their own manager")
-    if "manager_id" in changes and changes["manager_id"] and not db.query(Employee).filter(
-        Employee.id == changes["manager_id"]
-    ).first():
+    if "manager_id" in changes and changes["manager_id"] and not await db.get(Employee, changes["manager_id"]):
         raise HTTPException(status_code=404, detail="Manager not found")
 
     for field in ("full_name", "title", "department", "role", "manager_id", "is_active"):
         if field in changes:
             setattr(employee, field, changes[field])
     if "password" in changes and changes["password"]:
-        employee.password_hash = hash_password(changes["password"])
+        employee.password_hash = await hash_password_async(changes["password"])
 
-    db.commit()
-    db.refresh(employee)
+    await bump_table_versions(db, "employees", PRINCIPALS_VERSION)
+    await db.commit()
+    invalidate_principal(employee.id)
+    await db.refresh(employee)
     return employee
 
 
-@router.post("/admin/leaves")
-def admin_create_leave(
+@router.get("/admin/diagnostics", response_model=DiagnosticsOut)
+async def admin_diagnostics(current_employee: CurrentEmployee = Depends(get_current_employee)):
+    assert_admin(current_employee)
+    return {
+        "principal_cache": principal_cache.stats(),
+        "dashboard_cache": dashboard_cache.stats(),
+        "database_pool": pool_status(),
+        "replicas": replica_router.status(),
+    }
+
+
+@router.post("/admin/leaves", response_model=LeaveRequestOut)
+async def admin_create_leave(
     payload: AdminLeaveCreate,
-    current_employee: Employee = Depends(get_current_employee),
-    db: Session = Depends(get_db),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
 ):
-    _assert_admin(current_employee)
-    employee = db.query(Employee).filter(Employee.id == payload.employee_id).first()
+    assert_admin(current_employee)
+    employee = await db.get(Employee, payload.employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     if payload.end_date < payload.start_date:
         raise HTTPException(status_code=400, detail="end_date cannot be before start_date")
+    _assert_leave_length(payload.start_date, payload.end_date)
     if payload.status not in {"pending", "approved", "rejected"}:
         raise HTTPException(status_code=400, detail="Invalid status")
 
+    # Admin-entered leave is recorded against the balance but not limited by it.
     leave = LeaveRequest(
         employee_id=payload.employee_id,
         reason=payload.reason,
@@ -233,16 +545,21 @@ def admin_create_leave(
         status=payload.status,
     )
     db.add(leave)
-    db.commit()
-    db.refresh(leave)
+    await record_leave(db, leave)
+    await bump_table_versions(db, "leave_requests")
+    await db.commit()
+    await db.refresh(leave)
     return leave
 
 
-@router.get("/profile")
-def my_profile(current_employee: Employee = Depends(get_current_employee), db: Session = Depends(get_db)):
+@router.get("/profile", response_model=ProfileOut)
+async def my_profile(
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
+):
     manager = None
     if current_employee.manager_id:
-        manager = db.query(Employee).filter(Employee.id == current_employee.manager_id).first()
+        manager = await db.get(Employee, current_employee.manager_id)
 
     return {
         "id": current_employee.id,
@@ -256,75 +573,181 @@ def my_profile(current_employee: Employee = Depends(get_current_employee), db: S
     }
 
 
-@router.post("/attendance/check-in")
-def check_in(
+async def _attendance_for_day(db: AsyncSession, stmt, employee_id: int, work_date: date):
+    """Run an attendance write and return the affected row, using RETURNING when the dialect allows it."""
+    columns = Attendance.__table__.c
+    if db.bind.dialect.name in UPSERT_RETURNING_DIALECTS:
+        return (await db.execute(stmt.returning(*columns))).mappings().first()
+
+    result = await db.execute(stmt)
+    if result.rowcount == 0:
+        return None
+    return (
+        await db.execute(
+            select(*columns).where(
+                and_(Attendance.employee_id == employee_id, Attendance.work_date == work_date)
+            )
+        )
+    ).mappings().first()
+
+
+async def _record_attendance_event(db: AsyncSession, event: dict) -> dict:
+    """Journal an attendance event for the background flusher and return the day as it will be stored.
+
+    Check-ins skip the database: the flush upsert keeps the first stored check-in.
+    Check-outs only read the row when the journal holds no check-in for the day;
+    journaled days stay visible until their flush commits, so one of the two sees it.
+    """
+    employee_id, work_date = event["employee_id"], event["work_date"]
+    stored = None
+    if "check_out" in event and not attendance_journal.pending_for(employee_id).get(work_date, {}).get("check_in"):
+        stored = (
+            await db.execute(
+                select(*Attendance.__table__.c).where(
+                    and_(Attendance.employee_id == employee_id, Attendance.work_date == work_date)
+                )
+            )
+        ).mappings().first()
+        if not stored:
+            raise HTTPException(status_code=400, detail="Check-in missing for today")
+
+    state = await run_in_threadpool(attendance_journal.record, event)
+    base = dict(stored) if stored else dict.fromkeys(Attendance.__table__.c.keys())
+    return merge_pending(base, state)
+
+
+def _merge_pending_attendance(rows: list, employee_id: int, period: DateRange, first_page: bool) -> list[dict]:
+    """Overlay journaled events that have not been flushed yet onto a page of attendance rows."""
+    pending = attendance_journal.pending_for(employee_id)
+    columns = Attendance.__table__.c.keys()
+    merged = []
+    for row in rows:
+        record = {column: getattr(row, column) for column in columns}
+        state = pending.pop(record["work_date"], None)
+        merged.append(merge_pending(record, state) if state else record)
+
+    if first_page:
+        # Days whose first check-in is still in the journal have no row yet; the newest page shows them.
+        for work_date, state in pending.items():
+            if not state.get("check_in"):
+                continue
+            if (period.start and work_date < period.start) or (period.end and work_date > period.end):
+                continue
+            merged.append(merge_pending(dict.fromkeys(columns), state))
+        merged.sort(key=lambda record: record["work_date"], reverse=True)
+    return merged
+
+
+@router.post("/attendance/check-in", response_model=AttendanceOut)
+async def check_in(
     payload: AttendanceMarkRequest,
-    current_employee: Employee = Depends(get_current_employee),
-    db: Session = Depends(get_db),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
 ):
     today = date.today()
-    attendance = (
-        db.query(Attendance)
-        .filter(and_(Attendance.employee_id == current_employee.id, Attendance.work_date == today))
-        .first()
-    )
-
-    now = datetime.utcnow()
-    if not attendance:
-        attendance = Attendance(
-            employee_id=current_employee.id,
-            work_date=today,
-            status=payload.status,
-            check_in=now,
+    if attendance_journal.enabled:
+        return await _record_attendance_event(
+            db,
+            {
+                "employee_id": current_employee.id,
+                "work_date": today,
+                "status": payload.status,
+                "check_in": datetime.utcnow(),
+            },
         )
-        db.add(attendance)
-    else:
-        attendance.check_in = attendance.check_in or now
-        attendance.status = payload.status
 
-    db.commit()
-    db.refresh(attendance)
+    table = Attendance.__table__
+    stmt = insert_or_update(
+        db.bind.dialect.name,
+        table,
+        ["employee_id", "work_date"],
+        lambda new: {
+            "check_in": func.coalesce(table.c.check_in, new.check_in),
+            "status": new.status,
+        },
+    ).values(
+        employee_id=current_employee.id,
+        work_date=today,
+        status=payload.status,
+        check_in=datetime.utcnow(),
+    )
+
+    attendance = await _attendance_for_day(db, stmt, current_employee.id, today)
+    await db.commit()
     return attendance
 
 
-@router.post("/attendance/check-out")
-def check_out(current_employee: Employee = Depends(get_current_employee), db: Session = Depends(get_db)):
+@router.post("/attendance/check-out", response_model=AttendanceOut)
+async def check_out(
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
+):
     today = date.today()
-    attendance = (
-        db.query(Attendance)
-        .filter(and_(Attendance.employee_id == current_employee.id, Attendance.work_date == today))
-        .first()
+    if attendance_journal.enabled:
+        return await _record_attendance_event(
+            db, {"employee_id": current_employee.id, "work_date": today, "check_out": datetime.utcnow()}
+        )
+
+    stmt = (
+        update(Attendance.__table__)
+        .where(and_(Attendance.employee_id == current_employee.id, Attendance.work_date == today))
+        .values(check_out=datetime.utcnow())
     )
 
+    attendance = await _attendance_for_day(db, stmt, current_employee.id, today)
     if not attendance:
         raise HTTPException(status_code=400, detail="Check-in missing for today")
 
-    attendance.check_out = datetime.utcnow()
-    db.commit()
-    db.refresh(attendance)
+    await db.commit()
     return attendance
 
 
-@router.get("/attendance")
-def attendance_history(current_employee: Employee = Depends(get_current_employee), db: Session = Depends(get_db)):
-    rows = (
-        db.query(Attendance)
-        .filter(Attendance.employee_id == current_employee.id)
-        .order_by(Attendance.work_date.desc())
-        .limit(30)
-        .all()
+@router.get("/attendance", response_model=list[AttendanceOut])
+async def attendance_history(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    period: DateRange = Depends(date_range),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
+):
+    stmt = period.apply(
+        select(Attendance).where(Attendance.employee_id == current_employee.id),
+        Attendance.work_date,
     )
+    rows = await paginate(db, stmt, [Attendance.work_date, Attendance.id], page, response, descending=True)
+    if attendance_journal.enabled:
+        return _merge_pending_attendance(rows, current_employee.id, period, first_page=page.cursor is None)
     return rows
 
 
-@router.post("/leaves")
-def apply_leave(
+@router.post("/leaves", response_model=LeaveRequestOut)
+async def apply_leave(
     payload: LeaveRequestCreate,
-    current_employee: Employee = Depends(get_current_employee),
-    db: Session = Depends(get_db),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
 ):
     if payload.end_date < payload.start_date:
         raise HTTPException(status_code=400, detail="end_date cannot be before start_date")
+    _assert_leave_length(payload.start_date, payload.end_date)
+
+    costs = await leave_cost(db, payload.start_date, payload.end_date)
+    if not any(costs.values()):
+        raise HTTPException(status_code=400, detail="Leave range contains no working days")
+    # Days accrue monthly, so a request may draw on what will have accrued by its end.
+    today = _local_today()
+    as_of = {year: max(today, min(payload.end_date, date(year, 12, 31))) for year in costs}
+    accrued = {year: accrued_days(current_employee.joined_on, year, as_of[year]) for year in costs}
+    short_year = await reserve_leave(db, current_employee.id, costs, accrued)
+    if short_year is not None:
+        await db.rollback()
+        balance = await leave_balance(
+            db, current_employee.id, current_employee.joined_on, short_year, as_of[short_year]
+        )
+        raise HTTPException(
+            status_code=400,
+            detail=f"Insufficient leave balance for {short_year}: {costs[short_year]} working days requested, "
+            f"{balance['available']:g} available",
+        )
 
     leave = LeaveRequest(
         employee_id=current_employee.id,
@@ -334,31 +757,73 @@ def apply_leave(
         status="pending",
     )
     db.add(leave)
-    db.commit()
-    db.refresh(leave)
+    await db.commit()
+    await db.refresh(leave)
     return leave
 
 
-@router.get("/leaves")
-def my_leaves(current_employee: Employee = Depends(get_current_employee), db: Session = Depends(get_db)):
-    return (
-        db.query(LeaveRequest)
-        .filter(LeaveRequest.employee_id == current_employee.id)
-        .order_by(LeaveRequest.created_at.desc())
-        .all()
+@router.get("/leaves/balance", response_model=LeaveBalanceOut)
+async def my_leave_balance(
+    year: int | None = Query(default=None, ge=2000, le=2100),
+    employee_id: int | None = Query(default=None, description="Managers/admin only"),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
+):
+    today = _local_today()
+    year = year or today.year
+    employee_id = employee_id or current_employee.id
+    joined_on = current_employee.joined_on
+    if employee_id != current_employee.id:
+        if current_employee.role not in {"admin", "manager"}:
+            raise HTTPException(status_code=403, detail="Only managers/admin can view other balances")
+        employee = await db.get(Employee, employee_id)
+        if not employee:
+            raise HTTPException(status_code=404, detail="Employee not found")
+        joined_on = employee.joined_on
+    as_of = min(max(today, date(year, 1, 1)), date(year, 12, 31))
+    return await leave_balance(db, employee_id, joined_on, year, as_of)
+
+
+@router.get("/leaves", response_model=list[LeaveRequestOut])
+async def my_leaves(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    period: DateRange = Depends(date_range),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
+):
+    stmt = period.apply_overlap(
+        select(LeaveRequest).where(LeaveRequest.employee_id == current_employee.id),
+        LeaveRequest.start_date,
+        LeaveRequest.end_date,
     )
+    return await paginate(db, stmt, [LeaveRequest.created_at, LeaveRequest.id], page, response, descending=True)
 
 
-@router.get("/leaves/all")
-def all_leaves(current_employee: Employee = Depends(get_current_employee), db: Session = Depends(get_db)):
+@router.get("/leaves/all", response_model=list[LeaveListItemOut])
+async def all_leaves(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    period: DateRange = Depends(date_range),
+    current_employee: CurrentEmployee = Depends(get_current_reader),
+    db: AsyncSession = Depends(get_read_db),
+):
     if current_employee.role not in {"admin", "manager"}:
         raise HTTPException(status_code=403, detail="Only managers/admin can access all leaves")
 
-    leaves = (
-        db.query(LeaveRequest, Employee)
-        .join(Employee, LeaveRequest.employee_id == Employee.id)
-        .order_by(LeaveRequest.start_date.desc())
-        .all()
+    stmt = period.apply_overlap(
+        select(LeaveRequest, Employee).join(Employee, LeaveRequest.employee_id == Employee.id),
+        LeaveRequest.start_date,
+        LeaveRequest.end_date,
+    )
+    leaves = await paginate(
+        db,
+        stmt,
+        [LeaveRequest.start_date, LeaveRequest.id],
+        page,
+        response,
+        descending=True,
+        key=lambda row: (row[0].start_date, row[0].id),
     )
     return [
         {
@@ -374,115 +839,225 @@ def all_leaves(current_employee: Employee = Depends(get_current_employee), db: S
     ]
 
 
-@router.put("/leaves/{leave_id}")
-def update_leave_status(
+@router.get("/leaves/calendar", response_model=list[CalendarDayOut])
+async def leave_calendar(
+    period: DateRange = Depends(date_range),
+    team: str | None = Query(default=None, description="Restrict to one department"),
+    current_employee: CurrentEmployee = Depends(get_current_reader),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if current_employee.role not in {"admin", "manager"}:
+        raise HTTPException(status_code=403, detail="Only managers/admin can access the leave calendar")
+    if not period.start or not period.end:
+        raise HTTPException(status_code=400, detail="from and to are required")
+    span = (period.end - period.start).days + 1
+    if span > MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"Calendar range is limited to {MAX_CALENDAR_DAYS} days")
+
+    stmt = _approved_leaves_overlapping(period.start, period.end)
+    if team:
+        stmt = stmt.where(Employee.department == team)
+    leaves = (await db.execute(stmt.order_by(Employee.full_name.asc(), LeaveRequest.id.asc()))).all()
+
+    holidays = (
+        await db.scalars(
+            select(CompanyHoliday).where(
+                CompanyHoliday.holiday_date >= period.start,
+                CompanyHoliday.holiday_date <= period.end,
+            )
+        )
+    ).all()
+    holiday_by_date = {holiday.holiday_date: holiday.name for holiday in holidays}
+
+    out_by_day = [[] for _ in range(span)]
+    for leave, emp in leaves:
+        first = max(leave.start_date, period.start)
+        last = min(leave.end_date, period.end)
+        entry = {
+            "employee_id": emp.id,
+            "employee": emp.full_name,
+            "department": emp.department,
+            "leave_id": leave.id,
+        }
+        for offset in range((first - period.start).days, (last - period.start).days + 1):
+            out_by_day[offset].append(entry)
+
+    days = []
+    for offset, out in enumerate(out_by_day):
+        day = period.start + timedelta(days=offset)
+        days.append({"date": day, "holiday": holiday_by_date.get(day), "out": out})
+    return days
+
+
+@router.put("/leaves/{leave_id}", response_model=LeaveRequestOut)
+async def update_leave_status(
     leave_id: int,
     payload: LeaveStatusUpdate,
-    current_employee: Employee = Depends(get_current_employee),
-    db: Session = Depends(get_db),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
 ):
     if current_employee.role not in {"admin", "manager"}:
         raise HTTPException(status_code=403, detail="Only managers/admin can approve or reject")
 
-    leave = db.query(LeaveRequest).filter(LeaveRequest.id == leave_id).first()
+    leave = await db.get(LeaveRequest, leave_id)
     if not leave:
         raise HTTPException(status_code=404, detail="Leave request not found")
 
     if payload.status not in {"pending", "approved", "rejected"}:
         raise HTTPException(status_code=400, detail="Invalid status")
 
+    old_status = leave.status
     leave.status = payload.status
-    db.commit()
-    db.refresh(leave)
+    await change_leave_status(db, leave, old_status)
+    await bump_table_versions(db, "leave_requests")
+    await db.commit()
+    await db.refresh(leave)
     return leave
 
 
-@router.get("/holidays")
-def list_holidays(current_employee: Employee = Depends(get_current_employee), db: Session = Depends(get_db)):
-    return db.query(CompanyHoliday).order_by(CompanyHoliday.holiday_date.asc()).all()
+@router.get("/holidays", response_model=list[HolidayOut])
+async def list_holidays(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    period: DateRange = Depends(date_range),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
+):
+    if not_modified := await conditional_get(db, request, response, "holidays"):
+        return not_modified
+    stmt = period.apply(select(CompanyHoliday), CompanyHoliday.holiday_date)
+    return await paginate(db, stmt, [CompanyHoliday.holiday_date, CompanyHoliday.id], page, response)
 
 
-@router.post("/holidays")
-def create_holiday(
+@router.post("/holidays", response_model=HolidayOut)
+async def create_holiday(
     payload: HolidayCreate,
-    current_employee: Employee = Depends(get_current_employee),
-    db: Session = Depends(get_db),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
 ):
     if current_employee.role not in {"admin", "manager"}:
         raise HTTPException(status_code=403, detail="Only managers/admin can add holidays")
 
+    await refund_holiday(db, payload.holiday_date)
     item = CompanyHoliday(
         name=payload.name,
         holiday_date=payload.holiday_date,
         description=payload.description,
     )
     db.add(item)
-    db.commit()
-    db.refresh(item)
+    await bump_table_versions(db, "holidays")
+    await db.commit()
+    await db.refresh(item)
     return item
 
 
-@router.get("/team")
-def team_view(current_employee: Employee = Depends(get_current_employee), db: Session = Depends(get_db)):
+@router.get("/team", response_model=list[TeamMemberOut])
+async def team_view(
+    depth: int = Query(default=1, ge=1, le=MAX_TEAM_DEPTH),
+    current_employee: CurrentEmployee = Depends(get_current_reader),
+    db: AsyncSession = Depends(get_read_db),
+):
     if current_employee.role not in {"admin", "manager"}:
         return []
 
-    query = db.query(Employee).filter(Employee.is_active == True)
+    manager = aliased(Employee)
     if current_employee.role == "manager":
-        query = query.filter(Employee.manager_id == current_employee.id)
+        reports = (
+            select(Employee.id, literal(1).label("depth"))
+            .where(Employee.manager_id == current_employee.id)
+            .cte("reports", recursive=True)
+        )
+        reports = reports.union_all(
+            select(Employee.id, reports.c.depth + 1)
+            .join(reports, Employee.manager_id == reports.c.id)
+            .where(reports.c.depth < depth)
+        )
+        # A manager cycle can reach the same employee twice; keep the shortest path.
+        subtree = select(reports.c.id, func.min(reports.c.depth).label("depth")).group_by(reports.c.id).subquery()
+        stmt = (
+            select(Employee, manager.full_name, subtree.c.depth)
+            .join(subtree, subtree.c.id == Employee.id)
+            .where(Employee.id != current_employee.id)
+        )
+    else:
+        stmt = select(Employee, manager.full_name, literal(None).label("depth"))
 
-    team_members = query.order_by(Employee.full_name.asc()).all()
-    manager_map = {emp.id: emp.full_name for emp in db.query(Employee).all()}
+    rows = await db.execute(
+        stmt.outerjoin(manager, Employee.manager_id == manager.id)
+        .where(Employee.is_active == True)
+        .order_by(Employee.full_name.asc())
+    )
 
     return [
         {
             **_employee_label(emp),
-            "manager": manager_map.get(emp.manager_id),
+            "manager": manager_name,
+            "depth": report_depth,
         }
-        for emp in team_members
+        for emp, manager_name, report_depth in rows.all()
     ]
 
 
-@router.get("/projects")
-def list_projects(current_employee: Employee = Depends(get_current_employee), db: Session = Depends(get_db)):
-    projects = db.query(Project).order_by(Project.name.asc()).all()
-    result = []
-
-    for project in projects:
+@router.get("/projects", response_model=list[ProjectWithMembersOut])
+async def list_projects(
+    request: Request,
+    response: Response,
+    status: str | None = None,
+    code: str | None = None,
+    page: PageParams = Depends(page_params),
+    current_employee: CurrentEmployee = Depends(get_current_reader),
+    db: AsyncSession = Depends(get_read_db),
+):
+    # Member names come from employees, so their edits change this list too.
+    if not_modified := await conditional_get(db, request, response, "projects", "employees"):
+        return not_modified
+    stmt = select(Project)
+    if status:
+        stmt = stmt.where(Project.status == status)
+    if code:
+        stmt = stmt.where(Project.code == code)
+    projects = await paginate(db, stmt, [Project.name, Project.id], page, response)
+
+    members_by_project = {project.id: [] for project in projects}
+    if members_by_project:
         members = (
-            db.query(ProjectMember, Employee)
-            .join(Employee, ProjectMember.employee_id == Employee.id)
-            .filter(ProjectMember.project_id == project.id)
-            .all()
-        )
-        result.append(
-            {
-                "id": project.id,
-                "code": project.code,
-                "name": project.name,
-                "description": project.description,
-                "status": project.status,
-                "start_date": project.start_date,
-                "end_date": project.end_date,
-                "members": [
-                    {
-                        "employee_id": emp.id,
-                        "employee_name": emp.full_name,
-                        "allocation_percent": member.allocation_percent,
-                    }
-                    for member, emp in members
-                ],
-            }
-        )
+            await db.execute(
+                select(ProjectMember, Employee)
+                .join(Employee, ProjectMember.employee_id == Employee.id)
+                .where(ProjectMember.project_id.in_(members_by_project.keys()))
+                .order_by(ProjectMember.id.asc())
+            )
+        ).all()
+        for member, emp in members:
+            members_by_project[member.project_id].append(
+                {
+                    "employee_id": emp.id,
+                    "employee_name": emp.full_name,
+                    "allocation_percent": member.allocation_percent,
+                }
+            )
 
-    return result
+    return [
+        {
+            "id": project.id,
+            "code": project.code,
+            "name": project.name,
+            "description": project.description,
+            "status": project.status,
+            "start_date": project.start_date,
+            "end_date": project.end_date,
+            "members": members_by_project[project.id],
+        }
+        for project in projects
+    ]
 
 
-@router.post("/projects")
-def create_project(
+@router.post("/projects", response_model=ProjectOut)
+async def create_project(
     payload: ProjectCreate,
-    current_employee: Employee = Depends(get_current_employee),
-    db: Session = Depends(get_db),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
 ):
     if current_employee.role not in {"admin", "manager"}:
         raise HTTPException(status_code=403, detail="Only managers/admin can create projects")
@@ -496,31 +1071,32 @@ def create_project(
         status="active",
     )
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await bump_table_versions(db, "projects")
+    await db.commit()
+    await db.refresh(project)
     return project
 
 
-@router.post("/projects/{project_id}/members")
-def add_project_member(
+@router.post("/projects/{project_id}/members", response_model=ProjectMemberOut)
+async def add_project_member(
     project_id: int,
     payload: ProjectMemberAdd,
-    current_employee: Employee = Depends(get_current_employee),
-    db: Session = Depends(get_db),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
 ):
     if current_employee.role not in {"admin", "manager"}:
         raise HTTPException(status_code=403, detail="Only managers/admin can add members")
 
-    if not db.query(Project).filter(Project.id == project_id).first():
+    if not await db.get(Project, project_id):
         raise HTTPException(status_code=404, detail="Project not found")
 
-    if not db.query(Employee).filter(Employee.id == payload.employee_id).first():
+    if not await db.get(Employee, payload.employee_id):
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    exists = (
-        db.query(ProjectMember)
-        .filter(ProjectMember.project_id == project_id, ProjectMember.employee_id == payload.employee_id)
-        .first()
+    exists = await db.scalar(
+        select(ProjectMember.id).where(
+            ProjectMember.project_id == project_id, ProjectMember.employee_id == payload.employee_id
+        )
     )
     if exists:
         raise HTTPException(status_code=400, detail="Employee already assigned")
@@ -531,21 +1107,22 @@ def add_project_member(
         allocation_percent=payload.allocation_percent,
     )
     db.add(member)
-    db.commit()
-    db.refresh(member)
+    await bump_table_versions(db, "projects")
+    await db.commit()
+    await db.refresh(member)
     return member
 
 
-@router.post("/time-logs")
-def create_time_log(
+@router.post("/time-logs", response_model=TimeLogOut)
+async def create_time_log(
     payload: TimeLogCreate,
-    current_employee: Employee = Depends(get_current_employee),
-    db: Session = Depends(get_db),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
 ):
-    assignment = (
-        db.query(ProjectMember)
-        .filter(ProjectMember.project_id == payload.project_id, ProjectMember.employee_id == current_employee.id)
-        .first()
+    assignment = await db.scalar(
+        select(ProjectMember.id).where(
+            ProjectMember.project_id == payload.project_id, ProjectMember.employee_id == current_employee.id
+        )
     )
     if not assignment:
         raise HTTPException(status_code=403, detail="You are not a member of this project")
@@ -558,20 +1135,111 @@ def create_time_log(
         description=payload.description,
     )
     db.add(time_log)
-    db.commit()
-    db.refresh(time_log)
+    await record_time_logs(
+        db,
+        [
+            {
+                "employee_id": time_log.employee_id,
+                "project_id": time_log.project_id,
+                "work_date": time_log.work_date,
+                "hours": time_log.hours,
+            }
+        ],
+    )
+    await db.commit()
+    await db.refresh(time_log)
     return time_log
 
 
-@router.get("/time-logs")
-def list_my_time_logs(current_employee: Employee = Depends(get_current_employee), db: Session = Depends(get_db)):
-    logs = (
-        db.query(TimeLog, Project)
+@router.post("/time-logs/batch", response_model=TimeLogBatchResult)
+async def create_time_logs_batch(
+    payload: TimeLogBatchCreate,
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+    db: AsyncSession = Depends(get_db),
+):
+    entries = payload.entries
+    member_projects = set(
+        await db.scalars(
+            select(ProjectMember.project_id).where(
+                ProjectMember.employee_id == current_employee.id,
+                ProjectMember.project_id.in_({entry.project_id for entry in entries}),
+            )
+        )
+    )
+    logged_hours = dict(
+        (
+            await db.execute(
+                select(TimeLog.work_date, func.sum(TimeLog.hours))
+                .where(
+                    TimeLog.employee_id == current_employee.id,
+                    TimeLog.work_date.in_({entry.work_date for entry in entries}),
+                )
+                .group_by(TimeLog.work_date)
+            )
+        ).all()
+    )
+
+    results = []
+    rows = []
+    for index, entry in enumerate(entries):
+        day_total = (logged_hours.get(entry.work_date) or 0) + entry.hours
+        if entry.project_id not in member_projects:
+            detail = "You are not a member of this project"
+        elif day_total > MAX_HOURS_PER_DAY:
+            detail = f"More than {MAX_HOURS_PER_DAY} hours logged on {entry.work_date}"
+        else:
+            detail = None
+
+        if detail:
+            results.append({"index": index, "status": "rejected", "detail": detail})
+            continue
+
+        logged_hours[entry.work_date] = day_total
+        results.append({"index": index, "status": "created", "detail": None})
+        rows.append(
+            {
+                "employee_id": current_employee.id,
+                "project_id": entry.project_id,
+                "work_date": entry.work_date,
+                "hours": entry.hours,
+                "description": entry.description,
+            }
+        )
+
+    if rows:
+        await db.execute(insert(TimeLog), rows)
+        await record_time_logs(db, rows)
+        await db.commit()
+
+    return {
+        "created": len(rows),
+        "rejected": len(entries) - len(rows),
+        "results": results,
+    }
+
+
+@router.get("/time-logs", response_model=list[TimeLogListItemOut])
+async def list_my_time_logs(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    period: DateRange = Depends(date_range),
+    current_employee: CurrentEmployee = Depends(get_current_reader),
+    db: AsyncSession = Depends(get_read_db),
+):
+    stmt = period.apply(
+        select(TimeLog, Project)
         .join(Project, TimeLog.project_id == Project.id)
-        .filter(TimeLog.employee_id == current_employee.id)
-        .order_by(TimeLog.work_date.desc(), TimeLog.created_at.desc())
-        .limit(50)
-        .all()
+        .where(TimeLog.employee_id == current_employee.id),
+        TimeLog.work_date,
+    )
+    logs = await paginate(
+        db,
+        stmt,
+        [TimeLog.work_date, TimeLog.created_at, TimeLog.id],
+        page,
+        response,
+        descending=True,
+        key=lambda row: (row[0].work_date, row[0].created_at, row[0].id),
     )
     return [
         {
@@ -585,3 +1253,130 @@ def list_my_time_logs(current_employee: Employee = Depends(get_current_employee)
         }
         for log, project in logs
     ]
+
+
+@router.get("/reports/hours", response_model=list[HoursReportRow], response_model_exclude_unset=True)
+async def hours_report(
+    group_by: str = Query(default="project", pattern="^(project|employee|department|week)$"),
+    period: DateRange = Depends(date_range),
+    current_employee: CurrentEmployee = Depends(get_current_reader),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if current_employee.role not in {"admin", "manager"}:
+        raise HTTPException(status_code=403, detail="Only managers/admin can access reports")
+
+    summary = TimeLogDailySummary
+    totals = (func.sum(summary.total_hours), func.sum(summary.entry_count))
+    if group_by == "project":
+        stmt = (
+            select(Project.id, Project.code, Project.name, *totals)
+            .join(Project, Project.id == summary.project_id)
+            .group_by(Project.id, Project.code, Project.name)
+        )
+    elif group_by == "employee":
+        stmt = (
+            select(Employee.id, Employee.full_name, Employee.department, *totals)
+            .join(Employee, Employee.id == summary.employee_id)
+            .group_by(Employee.id, Employee.full_name, Employee.department)
+        )
+    elif group_by == "department":
+        stmt = (
+            select(Employee.department, *totals)
+            .join(Employee, Employee.id == summary.employee_id)
+            .group_by(Employee.department)
+        )
+    else:
+        stmt = select(summary.work_date, *totals).group_by(summary.work_date)
+
+    rows = (await db.execute(period.apply(stmt, summary.work_date))).all()
+
+    if group_by == "week":
+        # ISO weeks are bucketed here rather than in SQL, which has no portable ISO-week function.
+        weeks = defaultdict(lambda: [0.0, 0])
+        for work_date, hours, entries in rows:
+            iso_year, iso_week, _ = work_date.isocalendar()
+            weeks[(iso_year, iso_week)][0] += hours
+            weeks[(iso_year, iso_week)][1] += entries
+        return [
+            {
+                "week": f"{iso_year}-W{iso_week:02d}",
+                "week_start": date.fromisocalendar(iso_year, iso_week, 1),
+                "total_hours": round(hours, 2),
+                "entry_count": entries,
+            }
+            for (iso_year, iso_week), (hours, entries) in sorted(weeks.items())
+        ]
+
+    fields = {
+        "project": ("project_id", "project_code", "project"),
+        "employee": ("employee_id", "employee", "department"),
+        "department": ("department",),
+    }[group_by]
+    return [
+        {
+            **dict(zip(fields, row[: len(fields)])),
+            "total_hours": round(row[-2], 2),
+            "entry_count": row[-1],
+        }
+        for row in sorted(rows, key=lambda row: row[-2], reverse=True)
+    ]
+
+
+@router.get("/search", response_model=list[SearchHitOut], response_model_exclude_unset=True)
+async def search(
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    kind: str = Query(default="employees", alias="type", pattern="^(employees|time_logs)$"),
+    page: PageParams = Depends(page_params),
+    current_employee: CurrentEmployee = Depends(get_current_reader),
+    db: AsyncSession = Depends(get_read_db),
+):
+    # bm25/relevance scores from different indexes are not comparable, so each
+    # kind is ranked and paginated on its own.
+    terms = query_terms(q)
+    if not terms:
+        return []
+
+    dialect_name = db.bind.dialect.name
+    if kind == "employees":
+        stmt, rank = search_employees(select(Employee), dialect_name, terms)
+        rows = await paginate(
+            db,
+            stmt.add_columns(rank),
+            [rank, Employee.id],
+            page,
+            response,
+            key=lambda row: (row[1], row[0].id),
+        )
+        return [{"type": "employee", **_employee_label(emp), "rank": emp_rank} for emp, emp_rank in rows]
+
+    stmt = (
+        select(TimeLog, Employee.full_name, Project.code)
+        .join(Employee, Employee.id == TimeLog.employee_id)
+        .join(Project, Project.id == TimeLog.project_id)
+    )
+    if current_employee.role not in {"admin", "manager"}:
+        stmt = stmt.where(TimeLog.employee_id == current_employee.id)
+    stmt, rank = search_time_logs(stmt, dialect_name, terms)
+    rows = await paginate(
+        db,
+        stmt.add_columns(rank),
+        [rank, TimeLog.id],
+        page,
+        response,
+        key=lambda row: (row[3], row[0].id),
+    )
+    return [
+        {
+            "type": "time_log",
+            "id": log.id,
+            "rank": log_rank,
+            "employee_id": log.employee_id,
+            "employee": employee_name,
+            "project_code": project_code,
+            "work_date": log.work_date,
+            "hours": log.hours,
+            "description": log.description,
+        }
+        for log, employee_name, project_code, log_rank in rows
+    ]
@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+import os
+import zlib
+from datetime import date, datetime
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.core.dependencies import CurrentEmployee, assert_admin, get_current_employee
+from app.core.pagination import DateRange, date_range
+from app.models.attendance import Attendance
+from app.models.employee import Employee
+from app.models.project import Project
+from app.models.time_log import TimeLog
+
+router = APIRouter(prefix="/ems/admin/exports", tags=["Exports"])
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+
+
+def _serialize(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _encode_batch(columns: list[str], rows, export_format: str, include_header: bool) -> bytes:
+    buffer = io.StringIO()
+    if export_format == "ndjson":
+        for row in rows:
+            buffer.write(json.dumps({name: _serialize(value) for name, value in zip(columns, row)}))
+            buffer.write("\n")
+    else:
+        writer = csv.writer(buffer)
+        if include_header:
+            writer.writerow(columns)
+        writer.writerows([_serialize(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def _stream_rows(stmt, columns: list[str], export_format: str, compress: bool):
+    """Yield encoded export chunks one server-side cursor batch at a time.
+
+    The session is opened here rather than through ``get_db`` because the body
+    is produced after the endpoint has returned and its dependencies are closed.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    include_header = True
+
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for batch in result.partitions():
+            chunk = _encode_batch(columns, batch, export_format, include_header)
+            include_header = False
+            yield compressor.compress(chunk) if compressor else chunk
+
+        if include_header and export_format == "csv":
+            chunk = _encode_batch(columns, [], export_format, include_header)
+            yield compressor.compress(chunk) if compressor else chunk
+
+    if compressor:
+        yield compressor.flush()
+
+
+def _export_response(name: str, stmt, export_format: str, compress: bool) -> StreamingResponse:
+    columns = [column.name for column in stmt.selected_columns]
+    filename = f"{name}.{export_format}" + (".gz" if compress else "")
+    if compress:
+        media_type = "application/gzip"
+    elif export_format == "ndjson":
+        media_type = "application/x-ndjson"
+    else:
+        media_type = "text/csv"
+    return StreamingResponse(
+        _stream_rows(stmt, columns, export_format, compress),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/attendance")
+async def export_attendance(
+    export_format: str = Query(default="csv", alias="format", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    department: str | None = None,
+    period: DateRange = Depends(date_range),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+):
+    assert_admin(current_employee)
+    stmt = (
+        select(
+            Attendance.id.label("attendance_id"),
+            Employee.id.label("employee_id"),
+            Employee.email,
+            Employee.full_name,
+            Employee.department,
+            Attendance.work_date,
+            Attendance.status,
+            Attendance.check_in,
+            Attendance.check_out,
+        )
+        .join(Employee, Attendance.employee_id == Employee.id)
+        .order_by(Attendance.work_date.asc(), Attendance.id.asc())
+    )
+    if department:
+        stmt = stmt.where(Employee.department == department)
+    stmt = period.apply(stmt, Attendance.work_date)
+    return _export_response("attendance", stmt, export_format, gzip)
+
+
+@router.get("/time-logs")
+async def export_time_logs(
+    export_format: str = Query(default="csv", alias="format", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    department: str | None = None,
+    period: DateRange = Depends(date_range),
+    current_employee: CurrentEmployee = Depends(get_current_employee),
+):
+    assert_admin(current_employee)
+    stmt = (
+        select(
+            TimeLog.id.label("time_log_id"),
+            Employee.id.label("employee_id"),
+            Employee.email,
+            Employee.full_name,
+            Employee.department,
+            Project.code.label("project_code"),
+            Project.name.label("project_name"),
+            TimeLog.work_date,
+            TimeLog.hours,
+            TimeLog.description,
+            TimeLog.created_at,
+        )
+        .join(Employee, TimeLog.employee_id == Employee.id)
+        .join(Project, TimeLog.project_id == Project.id)
+        .order_by(TimeLog.work_date.asc(), TimeLog.id.asc())
+    )
+    if department:
+        stmt = stmt.where(Employee.department == department)
+    stmt = period.apply(stmt, TimeLog.work_date)
+    return _export_response("time_logs", stmt, export_format, gzip)
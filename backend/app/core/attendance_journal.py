@@ -0,0 +1,311 @@
+"""Write-behind buffering for attendance check-ins and check-outs.
+
+When ``ATTENDANCE_WRITE_BEHIND`` is enabled the attendance endpoints append
+each event to a local append-only journal (fsynced before the request is
+acknowledged) and a background task coalesces pending events per
+``(employee_id, work_date)`` and upserts them into ``attendance`` in batches.
+
+Appends are group-committed: every caller writes its line under a short lock,
+then one of the waiting callers fsyncs on behalf of all lines written so far,
+so a burst of check-ins shares fsyncs instead of queueing one per event.
+
+Flushing rotates the journal to ``<path>.flushing`` and only deletes it after
+the database commit, so a crash at any point leaves every acknowledged event
+on disk. While the batch is being written it stays visible to
+:meth:`AttendanceJournal.pending_for`, and a failed write merges it back.
+Startup replays whatever is left; replaying is idempotent because the first
+check-in time wins and later statuses and check-outs overwrite.
+"""
+import asyncio
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import date, datetime
+from pathlib import Path
+
+from sqlalchemy import and_, bindparam, func, update
+
+from app.core.database import AsyncSessionLocal
+from app.core.upsert import insert_or_update
+from app.models.attendance import Attendance
+
+logger = logging.getLogger(__name__)
+
+ATTENDANCE_WRITE_BEHIND = os.getenv("ATTENDANCE_WRITE_BEHIND", "false").lower() == "true"
+ATTENDANCE_JOURNAL_PATH = os.getenv("ATTENDANCE_JOURNAL_PATH", "./attendance.journal")
+ATTENDANCE_FLUSH_INTERVAL_SECONDS = float(os.getenv("ATTENDANCE_FLUSH_INTERVAL_SECONDS", "1.0"))
+ATTENDANCE_FLUSH_BATCH_SIZE = int(os.getenv("ATTENDANCE_FLUSH_BATCH_SIZE", "500"))
+
+
+def merge_pending(state: dict, event: dict) -> dict:
+    """Fold ``event`` into ``state``: the first check-in wins, later statuses and check-outs overwrite."""
+    merged = {**state, "employee_id": event["employee_id"], "work_date": event["work_date"]}
+    merged["status"] = event.get("status") or state.get("status")
+    merged["check_in"] = state.get("check_in") or event.get("check_in")
+    merged["check_out"] = event.get("check_out") or state.get("check_out")
+    return merged
+
+
+def _encode(event: dict) -> str:
+    return json.dumps(
+        {key: value.isoformat() if isinstance(value, (date, datetime)) else value for key, value in event.items()}
+    )
+
+
+def _decode(line: str) -> dict:
+    event = json.loads(line)
+    event["work_date"] = date.fromisoformat(event["work_date"])
+    for key in ("check_in", "check_out"):
+        if event.get(key):
+            event[key] = datetime.fromisoformat(event[key])
+    return event
+
+
+class AttendanceJournal:
+    def __init__(self, path: str, enabled: bool, flush_interval: float, batch_size: int):
+        self.path = Path(path)
+        self.flushing_path = self.path.with_name(self.path.name + ".flushing")
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending: dict[tuple[int, date], dict] = {}
+        # Rotated out of the journal and being written; not in the database yet.
+        self._inflight: dict[tuple[int, date], dict] = {}
+        self._lock = threading.Lock()
+        self._appended = 0
+        self._synced = 0
+        self._syncing = False
+        self._synced_changed = threading.Condition()
+        self._flush_lock = asyncio.Lock()
+        self._file = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def record(self, event: dict) -> dict:
+        """Durably append ``event`` and return the coalesced pending state for its day.
+
+        Blocks on fsync, so call it from a worker thread.
+        """
+        key = (event["employee_id"], event["work_date"])
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(_encode(event) + "\n")
+            self._file.flush()
+            self._appended += 1
+            sequence = self._appended
+            self._pending[key] = merge_pending(
+                self._pending.get(key, {"employee_id": key[0], "work_date": key[1]}), event
+            )
+            state = self._state_for(key)
+            backlog = len(self._pending)
+
+        self._sync_through(sequence)
+        if backlog >= self.batch_size and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return state
+
+    def _sync_through(self, sequence: int) -> None:
+        """Return once append ``sequence`` is on disk, fsyncing for every waiter when no one else is."""
+        with self._synced_changed:
+            while self._syncing and self._synced < sequence:
+                self._synced_changed.wait()
+            if self._synced >= sequence:
+                return
+            self._syncing = True
+
+        synced = None
+        try:
+            with self._lock:
+                target = self._appended
+                # A rotation fsyncs and closes the file, so a missing file means it is already durable.
+                descriptor = os.dup(self._file.fileno()) if self._file is not None else None
+            if descriptor is not None:
+                try:
+                    os.fsync(descriptor)
+                finally:
+                    os.close(descriptor)
+            synced = target
+        finally:
+            with self._synced_changed:
+                self._syncing = False
+                if synced is not None:
+                    self._synced = max(self._synced, synced)
+                self._synced_changed.notify_all()
+
+    def _state_for(self, key: tuple[int, date]) -> dict:
+        """The not-yet-stored state of one day: the batch being written, then newer events. Caller holds ``_lock``."""
+        inflight, pending = self._inflight.get(key), self._pending.get(key)
+        if inflight and pending:
+            return merge_pending(inflight, pending)
+        return dict(inflight or pending)
+
+    def pending_for(self, employee_id: int) -> dict[date, dict]:
+        with self._lock:
+            keys = {key for key in (*self._inflight, *self._pending) if key[0] == employee_id}
+            return {work_date: self._state_for((employee_id, work_date)) for _, work_date in keys}
+
+    def _rotate(self) -> dict:
+        """Move the live journal aside and hand back the pending events it holds. Caller holds ``_lock``."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+        if self.path.exists():
+            if self.flushing_path.exists():
+                # An earlier flush failed; keep its events and queue ours behind them.
+                with open(self.flushing_path, "ab") as target, open(self.path, "rb") as source:
+                    shutil.copyfileobj(source, target)
+                    target.flush()
+                    os.fsync(target.fileno())
+                self.path.unlink()
+            else:
+                os.replace(self.path, self.flushing_path)
+        for key, state in self._pending.items():
+            self._inflight[key] = merge_pending(self._inflight.get(key, {}), state)
+        self._pending = {}
+        return dict(self._inflight)
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            with self._lock:
+                pending = self._rotate()
+            if not pending and not self.flushing_path.exists():
+                return 0
+            try:
+                await self._write(list(pending.values()))
+            except Exception:
+                # Events recorded during the write are newer, so they merge on top of the batch.
+                with self._lock:
+                    for key, state in self._pending.items():
+                        self._inflight[key] = merge_pending(self._inflight.get(key, {}), state)
+                    self._pending, self._inflight = self._inflight, {}
+                raise
+            with self._lock:
+                self._inflight = {}
+            self.flushing_path.unlink(missing_ok=True)
+            return len(pending)
+
+    async def _write(self, states: list[dict]) -> None:
+        table = Attendance.__table__
+        check_ins = [state for state in states if state.get("check_in")]
+        check_outs = [state for state in states if not state.get("check_in") and state.get("check_out")]
+
+        async with AsyncSessionLocal() as db:
+            upsert = insert_or_update(
+                db.bind.dialect.name,
+                table,
+                ["employee_id", "work_date"],
+                lambda new: {
+                    "status": new.status,
+                    "check_in": func.coalesce(table.c.check_in, new.check_in),
+                    "check_out": func.coalesce(new.check_out, table.c.check_out),
+                },
+            )
+            for start in range(0, len(check_ins), self.batch_size):
+                await db.execute(
+                    upsert,
+                    [
+                        {
+                            "employee_id": state["employee_id"],
+                            "work_date": state["work_date"],
+                            "status": state.get("status") or "present",
+                            "check_in": state["check_in"],
+                            "check_out": state.get("check_out"),
+                        }
+                        for state in check_ins[start : start + self.batch_size]
+                    ],
+                )
+
+            set_check_out = (
+                update(table)
+                .where(
+                    and_(
+                        table.c.employee_id == bindparam("b_employee_id"),
+                        table.c.work_date == bindparam("b_work_date"),
+                    )
+                )
+                .values(check_out=bindparam("b_check_out"))
+            )
+            for start in range(0, len(check_outs), self.batch_size):
+                await db.execute(
+                    set_check_out,
+                    [
+                        {
+                            "b_employee_id": state["employee_id"],
+                            "b_work_date": state["work_date"],
+                            "b_check_out": state["check_out"],
+                        }
+                        for state in check_outs[start : start + self.batch_size]
+                    ],
+                )
+            await db.commit()
+
+    def _replay(self) -> int:
+        count = 0
+        with self._lock:
+            for path in (self.flushing_path, self.path):
+                if not path.exists():
+                    continue
+                with open(path, encoding="utf-8") as journal:
+                    for line in journal:
+                        if not line.strip():
+                            continue
+                        try:
+                            event = _decode(line)
+                        except (ValueError, KeyError):
+                            # A torn final line from a crash mid-append was never acknowledged.
+                            logger.warning("Skipping unreadable attendance journal line in %s", path)
+                            continue
+                        key = (event["employee_id"], event["work_date"])
+                        base = self._pending.get(key, {"employee_id": key[0], "work_date": key[1]})
+                        self._pending[key] = merge_pending(base, event)
+                        count += 1
+        return count
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Attendance journal flush failed; will retry")
+
+    async def start(self) -> None:
+        if not self.enabled:
+            return
+        replayed = self._replay()
+        if replayed:
+            logger.info("Replaying %s attendance journal events", replayed)
+            await self.flush()
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._loop = None
+        await self.flush()
+
+
+attendance_journal = AttendanceJournal(
+    ATTENDANCE_JOURNAL_PATH,
+    enabled=ATTENDANCE_WRITE_BEHIND,
+    flush_interval=ATTENDANCE_FLUSH_INTERVAL_SECONDS,
+    batch_size=ATTENDANCE_FLUSH_BATCH_SIZE,
+)
@@ -1,5 +1,14 @@
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import logging
+import threading
+import time
+
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -8,24 +17,303 @@ from dotenv import load_dotenv
 ROOT_ENV_FILE = Path(__file__).resolve().parents[3] / ".env"
 load_dotenv(dotenv_path=ROOT_ENV_FILE)
 load_dotenv()
+
+# Imported after the .env is loaded so its settings are visible to the module.
+from app.core.instrumentation import instrument_engine  # noqa: E402
+from app.core.metrics import DB_POOL_TIMEOUTS, DB_POOL_WAIT, instrument_pool  # noqa: E402
 DATABASE_URL = os.getenv("DATABASE_URL")
 FALLBACK_DATABASE_URL = os.getenv("FALLBACK_DATABASE_URL", "sqlite:///./ems_local.db")
+ALLOW_DATABASE_FALLBACK = os.getenv("ALLOW_DATABASE_FALLBACK", "false").lower() == "true"
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# Comma-separated read replicas for read-only endpoints; empty keeps every query on the primary.
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL_SECONDS", "5"))
+REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS", "2"))
 
 if not DATABASE_URL:
     DATABASE_URL = FALLBACK_DATABASE_URL
 
+logger = logging.getLogger(__name__)
+
+# Sync drivers used for startup tasks mapped to their asyncio counterparts for the request path.
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "mariadb": "mariadb+aiomysql",
+    "mariadb+pymysql": "mariadb+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+class PoolWaitStats:
+    """Time spent waiting for a pooled connection, including checkouts that timed out."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        DB_POOL_WAIT.observe(waited)
+        if timed_out:
+            DB_POOL_TIMEOUTS.inc()
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_wait_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_wait_stats.record(time.perf_counter() - started)
+        return connection
+
+
+def _pool_options(url) -> dict:
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
 
 def _build_engine(url: str):
-    return create_engine(url, echo=False)
+    engine = create_engine(url, echo=False, **_pool_options(url))
+    instrument_engine(engine)
+    return engine
 
 
-engine = _build_engine(DATABASE_URL)
+def _async_url(url):
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+
+def _build_async_engine(url):
+    options = _pool_options(url)
+    if options:
+        options["poolclass"] = InstrumentedAsyncPool
+    async_engine = create_async_engine(_async_url(url), echo=False, **options)
+    instrument_engine(async_engine.sync_engine)
+    instrument_pool(async_engine.pool, options.get("pool_size"), options.get("max_overflow"))
+    return async_engine
 
-try:
-    with engine.connect():
-        pass
-except Exception:
-    engine = _build_engine(FALLBACK_DATABASE_URL)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+_engine = None
+_async_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Sync engine for migrations, seeding and CLIs, built on first use.
+
+    Nothing connects at import time. The fallback probe only runs here, and
+    only when ``ALLOW_DATABASE_FALLBACK`` is set.
+    """
+    global _engine
+    if _engine is not None:
+        return _engine
+    with _engine_lock:
+        if _engine is None:
+            engine = _build_engine(DATABASE_URL)
+            if ALLOW_DATABASE_FALLBACK and DATABASE_URL != FALLBACK_DATABASE_URL:
+                try:
+                    with engine.connect():
+                        pass
+                except Exception:
+                    logger.warning(
+                        "Database %s is unreachable; falling back to %s because ALLOW_DATABASE_FALLBACK is set",
+                        make_url(DATABASE_URL).render_as_string(hide_password=True),
+                        FALLBACK_DATABASE_URL,
+                    )
+                    engine.dispose()
+                    engine = _build_engine(FALLBACK_DATABASE_URL)
+            SessionLocal.configure(bind=engine)
+            _engine = engine
+    return _engine
+
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is not None:
+        return _async_engine
+    url = get_engine().url
+    with _engine_lock:
+        if _async_engine is None:
+            _async_engine = _build_async_engine(url)
+            AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+class _LazySessionmaker(sessionmaker):
+    def __call__(self, **local_kw):
+        get_engine()
+        return super().__call__(**local_kw)
+
+
+class _LazyAsyncSessionmaker(async_sessionmaker):
+    def __call__(self, **local_kw):
+        get_async_engine()
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
+AsyncSessionLocal = _LazyAsyncSessionmaker(autoflush=False, expire_on_commit=False)
+
+
+class ReplicaRouter:
+    """Round-robin over the read replicas that passed their last health check.
+
+    Engines are built on first use. A background task started from the app
+    lifespan runs ``SELECT 1`` against every replica each
+    ``REPLICA_HEALTH_CHECK_INTERVAL_SECONDS``; until a replica has passed a
+    check, and whenever none is healthy, reads go to the primary.
+    """
+
+    def __init__(self, urls: list[str]):
+        self.urls = urls
+        self._engines = None
+        self._healthy: list[bool | None] = [None] * len(urls)
+        self._counter = itertools.count()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.urls)
+
+    @property
+    def engines(self) -> list:
+        if self._engines is None:
+            with _engine_lock:
+                if self._engines is None:
+                    self._engines = [_build_async_engine(url) for url in self.urls]
+        return self._engines
+
+    def pick(self):
+        healthy = [engine for engine, ok in zip(self.engines, self._healthy) if ok]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    async def _ping(self, engine) -> bool:
+        try:
+            async with engine.connect() as conn:
+                await asyncio.wait_for(conn.execute(text("SELECT 1")), REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS)
+            return True
+        except Exception:
+            return False
+
+    async def check(self) -> None:
+        results = await asyncio.gather(*(self._ping(engine) for engine in self.engines))
+        for index, ok in enumerate(results):
+            if ok != self._healthy[index]:
+                log = logger.info if ok else logger.warning
+                log(
+                    "Read replica %s is %s",
+                    make_url(self.urls[index]).render_as_string(hide_password=True),
+                    "healthy" if ok else "unavailable; reads fall back to the primary",
+                )
+        self._healthy = list(results)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(REPLICA_HEALTH_CHECK_INTERVAL_SECONDS)
+            await self.check()
+
+    async def start(self) -> None:
+        if not self.enabled:
+            return
+        await self.check()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> list[dict]:
+        return [
+            {"url": make_url(url).render_as_string(hide_password=True), "healthy": bool(ok)}
+            for url, ok in zip(self.urls, self._healthy)
+        ]
+
+
+replica_router = ReplicaRouter(DATABASE_REPLICA_URLS)
+
+
+def __getattr__(name: str):
+    # ``engine`` and ``async_engine`` stay importable for scripts without building them at import.
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def dispose_engines() -> None:
+    """Close the pools of every engine built so far; engines never used are not created."""
+    for async_engine in [_async_engine, *(replica_router._engines or [])]:
+        if async_engine is not None:
+            await async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+
+def pool_status() -> dict:
+    async_engine = get_async_engine()
+    pool = async_engine.pool
+    status = {
+        "url": async_engine.url.render_as_string(hide_password=True),
+        "pool_class": type(pool).__name__,
+    }
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "max_overflow": DB_MAX_OVERFLOW,
+                "timeout_seconds": DB_POOL_TIMEOUT,
+                **pool_wait_stats.snapshot(),
+            }
+        )
+    return status
@@ -1,31 +1,123 @@
+import os
+import time
+from dataclasses import dataclass
+from datetime import date
+
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal
+from app.core.cache import TTLCache
+from app.core.database import AsyncSessionLocal, replica_router
+from app.core.etag import table_versions
 from app.core.security import decode_access_token
 from app.models.employee import Employee
 
 security = HTTPBearer(auto_error=False)
 
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_YOUR_WRITES_CACHE_SIZE = int(os.getenv("READ_YOUR_WRITES_CACHE_SIZE", "10000"))
 
-def get_db():
-    db = SessionLocal()
-    try:
+
+@dataclass(frozen=True)
+class CurrentEmployee:
+    """Detached snapshot of the authenticated employee, safe to share between requests."""
+
+    id: int
+    email: str
+    full_name: str
+    title: str
+    department: str
+    role: str
+    manager_id: int | None
+    joined_on: date
+    is_active: bool
+
+    @classmethod
+    def from_model(cls, employee: Employee) -> "CurrentEmployee":
+        return cls(
+            id=employee.id,
+            email=employee.email,
+            full_name=employee.full_name,
+            title=employee.title,
+            department=employee.department,
+            role=employee.role,
+            manager_id=employee.manager_id,
+            joined_on=employee.joined_on,
+            is_active=employee.is_active,
+        )
+
+
+def assert_admin(employee: CurrentEmployee) -> None:
+    if employee.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can perform this action")
+
+
+# Version stamp in ``table_versions`` bumped with every change to an existing
+# employee. Cached principals carry the stamp they were loaded under and are
+# only served while it is current, so an update on any worker invalidates them
+# everywhere, at the cost of one primary-key lookup per request.
+PRINCIPALS_VERSION = "principals"
+
+# Token -> (principals version, CurrentEmployee).
+principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def invalidate_principal(employee_id: int) -> None:
+    """Drop this worker's entries right away; other workers notice the bumped stamp."""
+    principal_cache.discard_where(lambda entry: entry[1].id == employee_id)
+
+
+# Tokens that committed a write recently; their reads stay on the primary so they
+# never see a replica that has not caught up with their own change yet.
+recent_writers = TTLCache(maxsize=READ_YOUR_WRITES_CACHE_SIZE, ttl=READ_YOUR_WRITES_SECONDS)
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session: Session) -> None:
+    # Runs inside commit(), so the token is marked before the handler returns
+    # and the client can never read ahead of its own write.
+    token = session.info.get("writer_token")
+    if token:
+        recent_writers.set(token, True)
+
+
+async def get_db(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Primary session, for writes and for reads that must see the latest data."""
+    async with AsyncSessionLocal() as db:
+        if credentials and replica_router.enabled:
+            db.sync_session.info["writer_token"] = credentials.credentials
         yield db
-    finally:
-        db.close()
 
 
-def get_current_employee(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> Employee:
+async def get_read_db(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Session for read-only endpoints: a healthy replica when one is configured, otherwise the primary."""
+    engine = None
+    if not (credentials and recent_writers.get(credentials.credentials)):
+        engine = replica_router.pick()
+    session = AsyncSessionLocal(bind=engine) if engine is not None else AsyncSessionLocal()
+    async with session as db:
+        yield db
+
+
+async def _resolve_principal(credentials: HTTPAuthorizationCredentials | None, db: AsyncSession) -> CurrentEmployee:
     if not credentials:
         raise HTTPException(status_code=401, detail="Missing authorization token")
 
+    token = credentials.credentials
+    # Read before the employee row: a concurrent update bumps the stamp after this,
+    # so whatever this request caches is already marked stale.
+    (version,) = await table_versions(db, PRINCIPALS_VERSION)
+    cached = principal_cache.get(token)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
     try:
-        payload = decode_access_token(credentials.credentials)
+        payload = decode_access_token(token)
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
@@ -33,8 +125,30 @@ def get_current_employee(
     if not email:
         raise HTTPException(status_code=401, detail="Token payload is invalid")
 
-    employee = db.query(Employee).filter(Employee.email == email, Employee.is_active == True).first()
+    employee = await db.scalar(select(Employee).where(Employee.email == email, Employee.is_active == True))
     if not employee:
         raise HTTPException(status_code=401, detail="Employee not found or inactive")
 
-    return employee
+    principal = CurrentEmployee.from_model(employee)
+    # Never serve a cached principal past the token's own expiry.
+    principal_cache.set(token, (version, principal), ttl=payload.get("exp", 0) - time.time())
+    return principal
+
+
+async def get_current_employee(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> CurrentEmployee:
+    return await _resolve_principal(credentials, db)
+
+
+async def get_current_reader(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_read_db),
+) -> CurrentEmployee:
+    """Same principal as :func:`get_current_employee`, looked up through the read session.
+
+    Read-only endpoints use this together with :func:`get_read_db`; FastAPI
+    shares the one session between them, so no primary session is opened.
+    """
+    return await _resolve_principal(credentials, db)
@@ -0,0 +1,64 @@
+"""Strong ETags for reference-data lists, driven by per-table version stamps.
+
+Writers call :func:`bump_table_versions` inside the transaction that changes a
+table, so the stamp moves exactly when the data does, for every worker. A
+conditional GET then costs one primary-key lookup in ``table_versions``: when
+``If-None-Match`` still matches, the endpoint answers ``304`` without reading
+or serializing the table itself.
+"""
+import zlib
+
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.upsert import insert_or_update
+from app.models.table_version import TableVersion
+
+# Authenticated data: browsers may keep it, but must revalidate every time.
+CACHE_CONTROL = "private, no-cache"
+
+
+async def bump_table_versions(db: AsyncSession, *names: str) -> None:
+    table = TableVersion.__table__
+    stmt = insert_or_update(
+        db.bind.dialect.name,
+        table,
+        ["name"],
+        lambda new: {"version": table.c.version + 1},
+    )
+    await db.execute(stmt, [{"name": name, "version": 1} for name in names])
+
+
+async def table_versions(db: AsyncSession, *names: str) -> tuple[int, ...]:
+    """Current version stamps of ``names``, in order (0 for tables never written)."""
+    versions = dict(
+        (await db.execute(select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(names)))).all()
+    )
+    return tuple(versions.get(name, 0) for name in names)
+
+
+async def table_etag(db: AsyncSession, request: Request, *names: str) -> str:
+    """ETag over the listed tables' versions and the query string (filters, cursor, limit)."""
+    versions = await table_versions(db, *names)
+    stamp = ".".join(f"{name}-{version}" for name, version in zip(names, versions))
+    query = zlib.crc32(request.url.query.encode("utf-8"))
+    return f'"{stamp}.{query:08x}"'
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+async def conditional_get(db: AsyncSession, request: Request, response: Response, *names: str) -> Response | None:
+    """Return a ready ``304`` response when the client's copy is current, else tag ``response`` and return None."""
+    etag = await table_etag(db, request, *names)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if _matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
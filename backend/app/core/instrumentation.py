@@ -0,0 +1,134 @@
+"""Per-request SQL statistics.
+
+Engine event hooks time every cursor execution and add it to the stats of the
+request that issued it, found through a context variable (SQLAlchemy's async
+greenlets inherit the request task's context). :class:`QueryStatsMiddleware`
+opens those stats, reports them in a ``Server-Timing`` header and warns when
+one statement template runs often enough to look like an N+1 loop. The
+per-statement cost is two ``perf_counter`` calls and a dict increment.
+"""
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "true").lower() == "true"
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+
+
+class QueryStats:
+    __slots__ = ("count", "total", "slowest", "slowest_statement", "templates")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement = None
+        self.templates = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.templates[statement] += 1
+        if elapsed > self.slowest:
+            self.slowest = elapsed
+            self.slowest_statement = statement
+
+    def server_timing(self, app_elapsed: float) -> str:
+        return (
+            f'db;dur={self.total * 1000:.1f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest * 1000:.1f}, "
+            f"app;dur={app_elapsed * 1000:.1f}"
+        )
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        if self.count <= threshold:
+            return []
+        return [(statement, count) for statement, count in self.templates.most_common() if count > threshold]
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time so the
+    # pooled connection does not pair it with the next statement.
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the timing hooks to a sync engine (use ``async_engine.sync_engine`` for async ones)."""
+    if not SQL_INSTRUMENTATION or event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """Plain ASGI middleware so streaming responses are not buffered."""
+
+    def __init__(self, app, threshold: int = N_PLUS_ONE_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not SQL_INSTRUMENTATION:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timing = stats.server_timing(time.perf_counter() - started)
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            if stats.count and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "%s %s: %s queries, %.1f ms in db, slowest %.1f ms: %s",
+                    scope["method"],
+                    scope["path"],
+                    stats.count,
+                    stats.total * 1000,
+                    stats.slowest * 1000,
+                    " ".join(stats.slowest_statement.split())[:300],
+                )
+            for statement, count in stats.repeated(self.threshold):
+                logger.warning(
+                    "Possible N+1: %s %s ran the same statement %s times: %s",
+                    scope["method"],
+                    scope["path"],
+                    count,
+                    " ".join(statement.split())[:300],
+                )
@@ -0,0 +1,294 @@
+"""Working-day calendar and leave balances.
+
+A :class:`WorkingCalendar` is a per-year bitmap of working days (weekdays that
+are not a ``CompanyHoliday``) with a running count, so the working days in any
+date range cost two array lookups. Calendars are cached per year and holiday
+table version, so a new holiday invalidates them on every worker.
+
+``leave_balances`` holds, per employee and year, the working days booked by
+approved (``used_days``) and pending (``pending_days``) requests. Writers keep
+it in step inside their own transaction: :func:`record_leave` when a request is
+created, :func:`change_leave_status` when it moves, and :func:`refund_holiday`
+when a new holiday lands inside booked leave. Accrual is not stored: the annual
+allowance accrues in twelfths on the first of each month the employee has
+worked from, so it is derived from ``joined_on`` at read time.
+:func:`rebuild_leave_balances` recomputes the table for the whole organisation
+with NumPy and backs ``python -m app.core.leave_balance rebuild``.
+"""
+import os
+from collections import defaultdict
+from datetime import date
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.upsert import insert_or_update
+from app.models.holiday import CompanyHoliday
+from app.models.leave import LeaveRequest
+from app.models.leave_balance import LeaveBalance
+from app.models.table_version import TableVersion
+
+LEAVE_ANNUAL_ALLOWANCE_DAYS = float(os.getenv("LEAVE_ANNUAL_ALLOWANCE_DAYS", "20"))
+INSERT_CHUNK_SIZE = 10000
+
+# Statuses that hold days against a balance, and the column that holds them.
+BALANCE_COLUMNS = {"approved": "used_days", "pending": "pending_days"}
+
+calendar_cache = TTLCache(maxsize=16, ttl=3600)
+
+
+class WorkingCalendar:
+    __slots__ = ("year", "first_day", "working", "_working_before")
+
+    def __init__(self, year: int, holidays):
+        self.year = year
+        self.first_day = np.datetime64(date(year, 1, 1), "D")
+        days = np.arange(self.first_day, np.datetime64(date(year + 1, 1, 1), "D"))
+        self.working = np.is_busday(days, holidays=[day for day in holidays if day.year == year])
+        # _working_before[i] is the number of working days before day index i.
+        self._working_before = np.concatenate(([0], np.cumsum(self.working)))
+
+    def is_working_day(self, day: date) -> bool:
+        return bool(self.working[(day - date(self.year, 1, 1)).days])
+
+    def working_days(self, start: date, end: date) -> int:
+        """Working days in ``[start, end]`` that fall inside this calendar's year."""
+        return int(self.costs(np.array([start], "datetime64[D]"), np.array([end], "datetime64[D]"))[0])
+
+    def costs(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Vectorized :meth:`working_days` over ``datetime64[D]`` arrays of inclusive ranges."""
+        size = len(self.working)
+        first = np.clip((starts - self.first_day).astype(np.int64), 0, size)
+        last = np.clip((ends - self.first_day).astype(np.int64) + 1, 0, size)
+        return np.maximum(self._working_before[last] - self._working_before[first], 0)
+
+
+def _first_accrual_month(joined_on: date | None, year: int) -> int:
+    """Zero-based month of ``year`` from which the employee accrues (12 when never)."""
+    if joined_on is None:
+        return 0
+    index = (joined_on.year - year) * 12 + joined_on.month - 1 + (joined_on.day > 1)
+    return min(max(index, 0), 12)
+
+
+def entitled_days(joined_on: date | None, year: int) -> float:
+    return round(LEAVE_ANNUAL_ALLOWANCE_DAYS * (12 - _first_accrual_month(joined_on, year)) / 12, 2)
+
+
+def accrued_days(joined_on: date | None, year: int, as_of: date) -> float:
+    months_started = 0 if as_of.year < year else 12 if as_of.year > year else as_of.month
+    months = max(months_started - _first_accrual_month(joined_on, year), 0)
+    return round(LEAVE_ANNUAL_ALLOWANCE_DAYS * months / 12, 2)
+
+
+async def working_calendar(db: AsyncSession, year: int) -> WorkingCalendar:
+    version = await db.scalar(select(TableVersion.version).where(TableVersion.name == "holidays")) or 0
+    key = (year, version)
+    calendar = calendar_cache.get(key)
+    if calendar is None:
+        holidays = (
+            await db.scalars(
+                select(CompanyHoliday.holiday_date).where(
+                    CompanyHoliday.holiday_date >= date(year, 1, 1),
+                    CompanyHoliday.holiday_date <= date(year, 12, 31),
+                )
+            )
+        ).all()
+        calendar = WorkingCalendar(year, holidays)
+        calendar_cache.set(key, calendar)
+    return calendar
+
+
+async def leave_cost(db: AsyncSession, start: date, end: date) -> dict[int, int]:
+    """Working days in ``[start, end]`` per calendar year."""
+    costs = {}
+    for year in range(start.year, end.year + 1):
+        calendar = await working_calendar(db, year)
+        costs[year] = calendar.working_days(start, end)
+    return costs
+
+
+async def _add_to_balances(db: AsyncSession, deltas: dict[tuple[int, int], list[int]]) -> None:
+    """Add ``{(employee_id, year): [used, pending]}`` to the stored balances."""
+    deltas = {key: value for key, value in deltas.items() if any(value)}
+    if not deltas:
+        return
+    table = LeaveBalance.__table__
+    stmt = insert_or_update(
+        db.bind.dialect.name,
+        table,
+        ["employee_id", "year"],
+        lambda new: {
+            "used_days": table.c.used_days + new.used_days,
+            "pending_days": table.c.pending_days + new.pending_days,
+        },
+    )
+    await db.execute(
+        stmt,
+        [
+            {"employee_id": employee_id, "year": year, "used_days": used, "pending_days": pending}
+            for (employee_id, year), (used, pending) in deltas.items()
+        ],
+    )
+
+
+def _status_deltas(employee_id: int, costs: dict[int, int], status: str, sign: int) -> dict:
+    column = BALANCE_COLUMNS.get(status)
+    if column is None:
+        return {}
+    position = 0 if column == "used_days" else 1
+    deltas = {}
+    for year, days in costs.items():
+        value = [0, 0]
+        value[position] = sign * days
+        deltas[(employee_id, year)] = value
+    return deltas
+
+
+async def record_leave(db: AsyncSession, leave: LeaveRequest, costs: dict[int, int] | None = None) -> None:
+    costs = costs if costs is not None else await leave_cost(db, leave.start_date, leave.end_date)
+    await _add_to_balances(db, _status_deltas(leave.employee_id, costs, leave.status, 1))
+
+
+async def reserve_leave(
+    db: AsyncSession, employee_id: int, costs: dict[int, int], accrued: dict[int, float]
+) -> int | None:
+    """Book ``costs`` as pending days unless that would exceed ``accrued`` for some year.
+
+    Check and reservation are one conditional ``UPDATE`` per year, so concurrent
+    requests serialize on the balance row (its row lock on MariaDB, the write
+    lock on SQLite) and cannot overspend. Returns the first year that did not
+    fit, in which case the caller must roll back.
+    """
+    table = LeaveBalance.__table__
+    await db.execute(
+        insert_or_update(db.bind.dialect.name, table, ["employee_id", "year"], lambda new: {"year": table.c.year}),
+        [{"employee_id": employee_id, "year": year, "used_days": 0, "pending_days": 0} for year in costs],
+    )
+    for year, days in costs.items():
+        if not days:
+            continue
+        result = await db.execute(
+            update(table)
+            .where(
+                table.c.employee_id == employee_id,
+                table.c.year == year,
+                table.c.used_days + table.c.pending_days + days <= accrued[year],
+            )
+            .values(pending_days=table.c.pending_days + days)
+        )
+        if result.rowcount != 1:
+            return year
+    return None
+
+
+async def change_leave_status(db: AsyncSession, leave: LeaveRequest, old_status: str) -> None:
+    if BALANCE_COLUMNS.get(old_status) == BALANCE_COLUMNS.get(leave.status):
+        return
+    costs = await leave_cost(db, leave.start_date, leave.end_date)
+    deltas = defaultdict(lambda: [0, 0])
+    for sign, status in ((-1, old_status), (1, leave.status)):
+        for key, (used, pending) in _status_deltas(leave.employee_id, costs, status, sign).items():
+            deltas[key][0] += used
+            deltas[key][1] += pending
+    await _add_to_balances(db, deltas)
+
+
+async def refund_holiday(db: AsyncSession, holiday_date: date) -> None:
+    """Give back the day to every booked leave covering ``holiday_date``.
+
+    Must run before the holiday is inserted, while the cached calendar still
+    counts the day as working.
+    """
+    calendar = await working_calendar(db, holiday_date.year)
+    if not calendar.is_working_day(holiday_date):
+        return
+    rows = await db.execute(
+        select(LeaveRequest.employee_id, LeaveRequest.status, func.count(LeaveRequest.id))
+        .where(
+            LeaveRequest.status.in_(BALANCE_COLUMNS),
+            LeaveRequest.start_date <= holiday_date,
+            LeaveRequest.end_date >= holiday_date,
+        )
+        .group_by(LeaveRequest.employee_id, LeaveRequest.status)
+    )
+    deltas = defaultdict(lambda: [0, 0])
+    for employee_id, status, count in rows:
+        deltas[(employee_id, holiday_date.year)][0 if status == "approved" else 1] -= count
+    await _add_to_balances(db, deltas)
+
+
+async def leave_balance(db: AsyncSession, employee_id: int, joined_on: date | None, year: int, as_of: date) -> dict:
+    stored = await db.get(LeaveBalance, (employee_id, year))
+    used = stored.used_days if stored else 0
+    pending = stored.pending_days if stored else 0
+    accrued = accrued_days(joined_on, year, as_of)
+    return {
+        "employee_id": employee_id,
+        "year": year,
+        "as_of": as_of,
+        "annual_allowance": LEAVE_ANNUAL_ALLOWANCE_DAYS,
+        "entitled": entitled_days(joined_on, year),
+        "accrued": accrued,
+        "used": used,
+        "pending": pending,
+        "available": round(accrued - used - pending, 2),
+    }
+
+
+def rebuild_leave_balances(conn: Connection) -> int:
+    """Recompute ``leave_balances`` for every employee and year from the leave requests."""
+    conn.execute(delete(LeaveBalance))
+    rows = conn.execute(
+        select(LeaveRequest.employee_id, LeaveRequest.status, LeaveRequest.start_date, LeaveRequest.end_date).where(
+            LeaveRequest.status.in_(BALANCE_COLUMNS), LeaveRequest.end_date >= LeaveRequest.start_date
+        )
+    ).all()
+    if not rows:
+        return 0
+
+    employee_ids, statuses, starts, ends = (np.array(column) for column in zip(*rows))
+    starts = starts.astype("datetime64[D]")
+    ends = ends.astype("datetime64[D]")
+    approved = statuses == "approved"
+    size = int(employee_ids.max()) + 1
+    holidays = conn.scalars(select(CompanyHoliday.holiday_date)).all()
+
+    count = 0
+    first_year = int(starts.min().astype("datetime64[Y]").astype(int)) + 1970
+    last_year = int(ends.max().astype("datetime64[Y]").astype(int)) + 1970
+    for year in range(first_year, last_year + 1):
+        costs = WorkingCalendar(year, holidays).costs(starts, ends)
+        used = np.bincount(employee_ids, weights=np.where(approved, costs, 0), minlength=size).astype(np.int64)
+        pending = np.bincount(employee_ids, weights=np.where(approved, 0, costs), minlength=size).astype(np.int64)
+        booked = np.flatnonzero(used | pending)
+        for offset in range(0, len(booked), INSERT_CHUNK_SIZE):
+            chunk = booked[offset : offset + INSERT_CHUNK_SIZE]
+            conn.execute(
+                insert(LeaveBalance),
+                [
+                    {"employee_id": employee_id, "year": year, "used_days": used_days, "pending_days": pending_days}
+                    for employee_id, used_days, pending_days in zip(
+                        chunk.tolist(), used[chunk].tolist(), pending[chunk].tolist()
+                    )
+                ],
+            )
+        count += len(booked)
+    return count
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from app.core.database import engine
+
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("usage: python -m app.core.leave_balance rebuild")
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        count = rebuild_leave_balances(conn)
+    print(f"Rebuilt {count} leave balance rows in {time.perf_counter() - started:.2f}s")
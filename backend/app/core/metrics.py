@@ -0,0 +1,146 @@
+"""Prometheus metrics.
+
+Metrics live in ``prometheus_client``'s default registry. When the
+``PROMETHEUS_MULTIPROC_DIR`` environment variable points at a shared, empty
+directory (required with several uvicorn workers), every worker writes its
+samples to memory-mapped files there and ``/metrics`` aggregates them, so any
+worker can answer a scrape. Request-path updates are a counter increment and a
+histogram observe per request; pool gauges move on pool checkout/checkin events.
+"""
+import os
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# prometheus_client picks its storage backend from PROMETHEUS_MULTIPROC_DIR when
+# it is imported, so the .env has to be loaded first.
+ROOT_ENV_FILE = Path(__file__).resolve().parents[3] / ".env"
+load_dotenv(dotenv_path=ROOT_ENV_FILE)
+load_dotenv()
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram  # noqa: E402
+from prometheus_client import generate_latest, multiprocess  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.pool import Pool  # noqa: E402
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_LATENCY = Histogram(
+    "ems_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "ems_http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONFIGURED = Gauge(
+    "ems_db_pool_configured_connections",
+    "Configured pool size and overflow limit",
+    ["kind"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "ems_db_pool_checked_out_connections",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OPEN = Gauge(
+    "ems_db_pool_open_connections",
+    "DBAPI connections currently open by the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Histogram(
+    "ems_db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_TIMEOUTS = Counter("ems_db_pool_timeouts", "Pool checkouts that timed out")
+PASSWORD_HASH_LATENCY = Histogram(
+    "ems_password_hash_duration_seconds",
+    "PBKDF2 hash/verify latency including queueing for a worker",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+PASSWORD_HASH_REJECTED = Counter("ems_password_hash_rejected", "PBKDF2 jobs refused because the hasher was busy")
+LOGINS = Counter("ems_logins", "Login attempts by outcome", ["outcome"])
+
+
+def _on_connect(dbapi_connection, connection_record):
+    DB_POOL_OPEN.inc()
+
+
+def _on_close(dbapi_connection, connection_record):
+    DB_POOL_OPEN.dec()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    DB_POOL_CHECKED_OUT.dec()
+
+
+def instrument_pool(pool: Pool, size: int | None = None, max_overflow: int | None = None) -> None:
+    if event.contains(pool, "checkout", _on_checkout):
+        return
+    event.listen(pool, "connect", _on_connect)
+    event.listen(pool, "close", _on_close)
+    event.listen(pool, "checkout", _on_checkout)
+    event.listen(pool, "checkin", _on_checkin)
+    if size is not None:
+        DB_POOL_CONFIGURED.labels("size").inc(size)
+    if max_overflow is not None:
+        DB_POOL_CONFIGURED.labels("max_overflow").inc(max_overflow)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges from the shared directory on shutdown."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """Records latency by route template (never the raw path, to bound label cardinality)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(method, route.path if route else "unmatched", str(status)).observe(
+                time.perf_counter() - started
+            )
@@ -0,0 +1,179 @@
+"""Ordered, idempotent schema migrations.
+
+Each migration runs once per database and is recorded in ``schema_migrations``.
+Steps only create what is missing, so databases that were built by the old
+``create_all`` startup path upgrade in place. Run with
+``python -m app.core.migrations`` or let the application apply them at startup.
+On MariaDB/MySQL concurrent runs wait on a named lock; SQLite has none, so
+there only one process may run them at a time.
+"""
+import logging
+import os
+from contextlib import contextmanager
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.database import Base
+from app.core.leave_balance import rebuild_leave_balances
+from app.core.rollups import rebuild_daily_summaries
+from app.core.search import install_search_indexes
+import app.models  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_LOCK_NAME = "ems_schema_migrations"
+MIGRATION_LOCK_TIMEOUT_SECONDS = int(os.getenv("MIGRATION_LOCK_TIMEOUT_SECONDS", "600"))
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String(100), primary_key=True),
+    Column("applied_at", DateTime, server_default=func.now()),
+)
+
+
+def _table(name: str) -> Table:
+    return Base.metadata.tables[name]
+
+
+def _create_tables(conn: Connection, *names: str) -> None:
+    Base.metadata.create_all(conn, tables=[_table(name) for name in names], checkfirst=True)
+
+
+def _ensure_indexes(conn: Connection, table_name: str) -> None:
+    """Create any index declared on the model that the live table does not have yet."""
+    existing = {index["name"] for index in inspect(conn).get_indexes(table_name)}
+    for index in _table(table_name).indexes:
+        if index.name not in existing:
+            logger.info("Creating index %s on %s", index.name, table_name)
+            index.create(conn)
+
+
+def _drop_indexes(conn: Connection, table_name: str, *names: str) -> None:
+    existing = {index["name"] for index in inspect(conn).get_indexes(table_name)}
+    for name in names:
+        if name in existing:
+            logger.info("Dropping index %s on %s", name, table_name)
+            suffix = f" ON {table_name}" if conn.dialect.name in {"mysql", "mariadb"} else ""
+            conn.execute(text(f"DROP INDEX {name}{suffix}"))
+
+
+def _initial_schema(conn: Connection) -> None:
+    _create_tables(
+        conn,
+        "employees",
+        "projects",
+        "project_members",
+        "company_holidays",
+        "leave_requests",
+        "attendance",
+        "time_logs",
+    )
+
+
+def _hot_path_indexes(conn: Connection) -> None:
+    # The unique (employee_id, work_date) index cannot be built over duplicate
+    # rows, so keep the earliest record for each employee and day.
+    removed = conn.execute(
+        text(
+            "DELETE FROM attendance WHERE id NOT IN ("
+            "SELECT id FROM (SELECT MIN(id) AS id FROM attendance GROUP BY employee_id, work_date) AS keep_rows"
+            ")"
+        )
+    ).rowcount
+    if removed:
+        logger.warning("Removed %s duplicate attendance rows before adding the unique index", removed)
+
+    for table_name in ("employees", "projects", "project_members", "leave_requests", "attendance", "time_logs"):
+        _ensure_indexes(conn, table_name)
+
+
+def _time_log_daily_summaries(conn: Connection) -> None:
+    _create_tables(conn, "time_log_daily_summaries")
+    rebuild_daily_summaries(conn)
+
+
+def _table_versions(conn: Connection) -> None:
+    _create_tables(conn, "table_versions")
+
+
+def _search_indexes(conn: Connection) -> None:
+    install_search_indexes(conn)
+
+
+def _leave_balances(conn: Connection) -> None:
+    _create_tables(conn, "leave_balances")
+    rebuild_leave_balances(conn)
+
+
+def _drop_redundant_employee_indexes(conn: Connection) -> None:
+    # The composite indexes from 0002 lead with employee_id, so they serve these
+    # lookups (and the foreign keys) on their own.
+    _drop_indexes(conn, "attendance", "ix_attendance_employee_id")
+    _drop_indexes(conn, "time_logs", "ix_time_logs_employee_id")
+    _drop_indexes(conn, "project_members", "ix_project_members_employee_id")
+
+
+def _drop_redundant_leave_employee_index(conn: Connection) -> None:
+    # ix_leave_requests_employee_created leads with employee_id.
+    _drop_indexes(conn, "leave_requests", "ix_leave_requests_employee_id")
+
+
+MIGRATIONS = [
+    ("0001_initial_schema", _initial_schema),
+    ("0002_hot_path_indexes", _hot_path_indexes),
+    ("0003_time_log_daily_summaries", _time_log_daily_summaries),
+    ("0004_table_versions", _table_versions),
+    ("0005_search_indexes", _search_indexes),
+    ("0006_leave_balances", _leave_balances),
+    ("0007_drop_redundant_employee_indexes", _drop_redundant_employee_indexes),
+    ("0008_drop_redundant_leave_employee_index", _drop_redundant_leave_employee_index),
+]
+
+
+@contextmanager
+def _migration_lock(engine: Engine):
+    """Hold a server-wide named lock so workers starting together migrate one at a time."""
+    if engine.dialect.name not in {"mysql", "mariadb"}:
+        yield
+        return
+    with engine.connect() as conn:
+        acquired = conn.scalar(
+            text("SELECT GET_LOCK(:name, :timeout)"),
+            {"name": MIGRATION_LOCK_NAME, "timeout": MIGRATION_LOCK_TIMEOUT_SECONDS},
+        )
+        if acquired != 1:
+            raise RuntimeError(f"Timed out after {MIGRATION_LOCK_TIMEOUT_SECONDS}s waiting for the migration lock")
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATION_LOCK_NAME})
+
+
+def run_migrations(engine: Engine) -> list[str]:
+    applied_now = []
+    with _migration_lock(engine):
+        # Read under the lock: a worker that waited sees what the previous holder applied.
+        with engine.begin() as conn:
+            schema_migrations.create(conn, checkfirst=True)
+            applied = set(conn.scalars(select(schema_migrations.c.version)))
+
+        for version, migrate in MIGRATIONS:
+            if version in applied:
+                continue
+            with engine.begin() as conn:
+                logger.info("Applying migration %s", version)
+                migrate(conn)
+                conn.execute(schema_migrations.insert().values(version=version))
+            applied_now.append(version)
+
+    return applied_now
+
+
+if __name__ == "__main__":
+    from app.core.database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    applied = run_migrations(engine)
+    print(f"Applied {len(applied)} migration(s)" + (f": {', '.join(applied)}" if applied else ""))
@@ -0,0 +1,129 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+@dataclass
+class PageParams:
+    limit: int
+    cursor: str | None
+
+
+def page_params(
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+) -> PageParams:
+    return PageParams(limit=limit, cursor=cursor)
+
+
+@dataclass
+class DateRange:
+    start: date | None
+    end: date | None
+
+    def apply(self, stmt, column):
+        if self.start:
+            stmt = stmt.where(column >= self.start)
+        if self.end:
+            stmt = stmt.where(column <= self.end)
+        return stmt
+
+    def apply_overlap(self, stmt, start_column, end_column):
+        if self.start:
+            stmt = stmt.where(end_column >= self.start)
+        if self.end:
+            stmt = stmt.where(start_column <= self.end)
+        return stmt
+
+
+def date_range(
+    date_from: date | None = Query(default=None, alias="from"),
+    date_to: date | None = Query(default=None, alias="to"),
+) -> DateRange:
+    if date_from and date_to and date_to < date_from:
+        raise HTTPException(status_code=400, detail="to cannot be before from")
+    return DateRange(start=date_from, end=date_to)
+
+
+def _to_json(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _from_json(value, python_type):
+    if value is None:
+        return None
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values: tuple) -> str:
+    raw = json.dumps([_to_json(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("utf-8").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("utf-8")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("Cursor does not match sort key")
+        return [_from_json(value, column.type.python_type) for value, column in zip(values, columns)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(columns: list, values: list, descending: bool = False):
+    """Row-value comparison ``(c1, c2, ...) > (v1, v2, ...)`` expanded so each branch can use the index."""
+    clauses = []
+    for position, column in enumerate(columns):
+        equal_prefix = [columns[i] == values[i] for i in range(position)]
+        step = column < values[position] if descending else column > values[position]
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt,
+    columns: list,
+    page: PageParams,
+    response: Response,
+    descending: bool = False,
+    key=None,
+):
+    """Return one page of ``stmt`` ordered by ``columns`` and set the next-page cursor header.
+
+    ``columns`` must end with a unique column (usually the primary key) so the
+    ordering is total. ``key`` extracts the sort values from a result row and
+    defaults to reading the column attributes off the row itself. Statements
+    selecting a single entity yield entities; multi-entity statements yield rows.
+    """
+    if page.cursor:
+        stmt = stmt.where(keyset_filter(columns, decode_cursor(page.cursor, columns), descending))
+
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    stmt = stmt.order_by(*ordering).limit(page.limit + 1)
+    result = await db.execute(stmt)
+    rows = result.scalars().all() if len(stmt.column_descriptions) == 1 else result.all()
+
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        if key is None:
+            key = lambda row: tuple(getattr(row, column.key) for column in columns)
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(key(rows[-1]))
+
+    return rows
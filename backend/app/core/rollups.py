@@ -0,0 +1,79 @@
+"""Daily time-log rollups kept in step with ``time_logs``.
+
+Writers call :func:`record_time_logs` inside the same transaction as the raw
+insert. :func:`rebuild_daily_summaries` recomputes the table from scratch and
+backs ``python -m app.core.rollups rebuild``.
+"""
+from collections import defaultdict
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.upsert import insert_or_update
+from app.models.time_log import TimeLog
+from app.models.time_log_summary import TimeLogDailySummary
+
+SUMMARY_KEY = ["employee_id", "project_id", "work_date"]
+
+
+async def record_time_logs(db: AsyncSession, rows: list[dict]) -> None:
+    totals = defaultdict(lambda: [0.0, 0])
+    for row in rows:
+        bucket = totals[(row["employee_id"], row["project_id"], row["work_date"])]
+        bucket[0] += row["hours"]
+        bucket[1] += 1
+
+    table = TimeLogDailySummary.__table__
+    stmt = insert_or_update(
+        db.bind.dialect.name,
+        table,
+        SUMMARY_KEY,
+        lambda new: {
+            "total_hours": table.c.total_hours + new.total_hours,
+            "entry_count": table.c.entry_count + new.entry_count,
+        },
+    )
+    await db.execute(
+        stmt,
+        [
+            {
+                "employee_id": employee_id,
+                "project_id": project_id,
+                "work_date": work_date,
+                "total_hours": hours,
+                "entry_count": count,
+            }
+            for (employee_id, project_id, work_date), (hours, count) in totals.items()
+        ],
+    )
+
+
+def rebuild_daily_summaries(conn: Connection) -> int:
+    conn.execute(delete(TimeLogDailySummary))
+    aggregate = select(
+        TimeLog.employee_id,
+        TimeLog.project_id,
+        TimeLog.work_date,
+        func.sum(TimeLog.hours),
+        func.count(TimeLog.id),
+    ).group_by(TimeLog.employee_id, TimeLog.project_id, TimeLog.work_date)
+    result = conn.execute(
+        insert(TimeLogDailySummary).from_select(
+            SUMMARY_KEY + ["total_hours", "entry_count"],
+            aggregate,
+        )
+    )
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    import sys
+
+    from app.core.database import engine
+
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("usage: python -m app.core.rollups rebuild")
+    with engine.begin() as conn:
+        count = rebuild_daily_summaries(conn)
+    print(f"Rebuilt {count} daily summary rows")
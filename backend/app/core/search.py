@@ -0,0 +1,128 @@
+"""Full-text search over employees and time-log descriptions.
+
+SQLite keeps FTS5 external-content tables (``employees_fts``, ``time_logs_fts``)
+that share rowids with the base tables and are maintained by triggers, so ORM
+writes, bulk Core inserts and manual SQL all stay in sync without application
+code. MariaDB/MySQL uses native InnoDB ``FULLTEXT`` indexes, which the engine
+maintains itself. Queries are prefix matches on every term (type-ahead) and
+ranked by bm25 on SQLite or the boolean-mode relevance on MariaDB; both are
+exposed as an ascending ``rank`` so keyset pagination works the same way.
+"""
+import re
+
+from sqlalchemy import Float, column, inspect, literal_column, table, text, type_coerce
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.engine import Connection
+
+from app.models.employee import Employee
+from app.models.time_log import TimeLog
+
+MAX_QUERY_TERMS = 8
+# Single-character prefixes match most of the index and are too costly to rank.
+MIN_TERM_LENGTH = 2
+
+# Column weights for bm25 on SQLite: a hit in the name outranks one in the title,
+# which outranks department or email.
+EMPLOYEE_COLUMN_WEIGHTS = (4.0, 2.0, 1.0, 1.0)
+
+EMPLOYEE_SEARCH_COLUMNS = ("full_name", "title", "department", "email")
+TIME_LOG_SEARCH_COLUMNS = ("description",)
+
+FULLTEXT_INDEXES = {
+    "employees": ("ft_employees_search", EMPLOYEE_SEARCH_COLUMNS),
+    "time_logs": ("ft_time_logs_description", TIME_LOG_SEARCH_COLUMNS),
+}
+
+employees_fts = table("employees_fts", column("rowid"), column("rank"))
+time_logs_fts = table("time_logs_fts", column("rowid"), column("rank"))
+
+_TERM = re.compile(r"\w+")
+
+
+def query_terms(q: str) -> list[str]:
+    """Split free text into at most ``MAX_QUERY_TERMS`` lower-cased word terms, dropping operators."""
+    terms = [term.lower() for term in _TERM.findall(q) if len(term) >= MIN_TERM_LENGTH]
+    return terms[:MAX_QUERY_TERMS]
+
+
+def _fts5_query(terms: list[str]) -> str:
+    # Quoting each term keeps FTS5 syntax (AND, NEAR, column:, ...) inert.
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _boolean_mode_query(terms: list[str]) -> str:
+    return " ".join(f"+{term}*" for term in terms)
+
+
+def _fts5_sync_triggers(name: str, columns: tuple[str, ...]) -> list[str]:
+    fts = f"{name}_fts"
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{col}" for col in columns)
+    old_values = ", ".join(f"old.{col}" for col in columns)
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});"
+    insert_new = f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {name}_fts_insert AFTER INSERT ON {name} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_fts_delete AFTER DELETE ON {name} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_fts_update AFTER UPDATE OF {column_list} ON {name} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def _install_fts5(conn: Connection) -> None:
+    for name, columns in (("employees", EMPLOYEE_SEARCH_COLUMNS), ("time_logs", TIME_LOG_SEARCH_COLUMNS)):
+        fts = f"{name}_fts"
+        # prefix='2 3' adds prefix indexes so short type-ahead terms avoid a term-list scan.
+        conn.execute(
+            text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                f"{', '.join(columns)}, content='{name}', content_rowid='id', prefix='2 3')"
+            )
+        )
+        for statement in _fts5_sync_triggers(name, columns):
+            conn.execute(text(statement))
+        conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+    weights = ", ".join(str(weight) for weight in EMPLOYEE_COLUMN_WEIGHTS)
+    conn.execute(text(f"INSERT INTO employees_fts(employees_fts, rank) VALUES ('rank', 'bm25({weights})')"))
+
+
+def _install_fulltext(conn: Connection) -> None:
+    for table_name, (index_name, columns) in FULLTEXT_INDEXES.items():
+        existing = {index["name"] for index in inspect(conn).get_indexes(table_name)}
+        if index_name not in existing:
+            conn.execute(text(f"CREATE FULLTEXT INDEX {index_name} ON {table_name} ({', '.join(columns)})"))
+
+
+def install_search_indexes(conn: Connection) -> None:
+    dialect_name = conn.dialect.name
+    if dialect_name == "sqlite":
+        _install_fts5(conn)
+    elif dialect_name in {"mysql", "mariadb"}:
+        _install_fulltext(conn)
+    else:
+        raise NotImplementedError(f"Full-text search is not supported for the {dialect_name} dialect")
+
+
+def search_employees(stmt, dialect_name: str, terms: list[str]):
+    """Restrict ``stmt`` (selecting from ``employees``) to matches; returns ``(stmt, rank)``."""
+    if dialect_name == "sqlite":
+        stmt = stmt.join(employees_fts, employees_fts.c.rowid == Employee.id).where(
+            literal_column("employees_fts").op("MATCH")(_fts5_query(terms))
+        )
+        return stmt, type_coerce(employees_fts.c.rank, Float)
+    relevance = match(
+        Employee.full_name, Employee.title, Employee.department, Employee.email, against=_boolean_mode_query(terms)
+    ).in_boolean_mode()
+    return stmt.where(relevance), -type_coerce(relevance, Float)
+
+
+def search_time_logs(stmt, dialect_name: str, terms: list[str]):
+    """Restrict ``stmt`` (selecting from ``time_logs``) to matches; returns ``(stmt, rank)``."""
+    if dialect_name == "sqlite":
+        stmt = stmt.join(time_logs_fts, time_logs_fts.c.rowid == TimeLog.id).where(
+            literal_column("time_logs_fts").op("MATCH")(_fts5_query(terms))
+        )
+        return stmt, type_coerce(time_logs_fts.c.rank, Float)
+    relevance = match(TimeLog.description, against=_boolean_mode_query(terms)).in_boolean_mode()
+    return stmt.where(relevance), -type_coerce(relevance, Float)
@@ -1,13 +1,19 @@
+import asyncio
 import base64
 import hashlib
 import hmac
+import multiprocessing
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from dotenv import load_dotenv
 from jose import JWTError, jwt
 
+from app.core.metrics import PASSWORD_HASH_LATENCY, PASSWORD_HASH_REJECTED
+
 ROOT_ENV_FILE = Path(__file__).resolve().parents[3] / ".env"
 load_dotenv(dotenv_path=ROOT_ENV_FILE)
 load_dotenv()
@@ -16,6 +22,16 @@ SECRET_KEY = os.getenv("SECRET_KEY", "change-me")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 TOKEN_EXPIRE_MINUTES = int(os.getenv("TOKEN_EXPIRE_MINUTES", "480"))
 PASSWORD_ITERATIONS = int(os.getenv("PASSWORD_ITERATIONS", "100000"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "64"))
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when the password hashing queue is full."""
+
+
+_hash_pool: ProcessPoolExecutor | None = None
+_hash_jobs = 0
 
 
 def create_access_token(data: dict) -> str:
@@ -56,3 +72,61 @@ def verify_password(password: str, encoded_password: str) -> bool:
         return hmac.compare_digest(computed, expected)
     except Exception:
         return False
+
+
+def _get_hash_pool() -> ProcessPoolExecutor | None:
+    global _hash_pool
+    if _hash_pool is None and PASSWORD_HASH_WORKERS > 0:
+        # Forked workers would inherit the event loop, DB connections and locks held by other threads;
+        # start them from a clean interpreter instead.
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS, mp_context=multiprocessing.get_context(method)
+        )
+    return _hash_pool
+
+
+async def _run_kdf(operation: str, func, *args):
+    """Run PBKDF2 work off the event loop in the dedicated process pool.
+
+    At most ``PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT`` jobs may be in
+    flight; beyond that callers get ``PasswordHasherBusy`` instead of queueing
+    without bound. With ``PASSWORD_HASH_WORKERS=0`` the default thread pool is used.
+    """
+    global _hash_jobs
+    if _hash_jobs >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT:
+        PASSWORD_HASH_REJECTED.inc()
+        raise PasswordHasherBusy("Too many password operations in progress")
+
+    _hash_jobs += 1
+    started = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_hash_pool(), func, *args)
+    finally:
+        _hash_jobs -= 1
+        PASSWORD_HASH_LATENCY.labels(operation).observe(time.perf_counter() - started)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_kdf("hash", hash_password, password)
+
+
+async def verify_password_async(password: str, encoded_password: str) -> bool:
+    return await _run_kdf("verify", verify_password, password, encoded_password)
+
+
+async def hash_passwords_async(passwords: list[str]) -> list[str]:
+    """Hash many passwords, keeping at most one job per worker in flight so logins can still queue."""
+    batch_size = max(1, PASSWORD_HASH_WORKERS)
+    hashes = []
+    for start in range(0, len(passwords), batch_size):
+        batch = passwords[start : start + batch_size]
+        hashes.extend(await asyncio.gather(*(hash_password_async(password) for password in batch)))
+    return hashes
+
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
@@ -2,6 +2,8 @@ from datetime import date, timedelta
 
 from sqlalchemy.orm import Session
 
+from app.core.leave_balance import rebuild_leave_balances
+from app.core.rollups import rebuild_daily_summaries
 from app.core.security import hash_password
 from app.models.attendance import Attendance
 from app.models.employee import Employee
@@ -124,5 +126,8 @@ def seed_initial_data(db: Session) -> None:
             description="Prepared requirement checklist and sprint stories",
         ),
     ])
+    db.flush()
+    rebuild_daily_summaries(db.connection())
+    rebuild_leave_balances(db.connection())
 
     db.commit()
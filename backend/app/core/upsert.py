@@ -0,0 +1,23 @@
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+# Dialects whose upsert can return the row as it stands after the insert or
+# update. MariaDB's INSERT ... RETURNING does not cover the duplicate-key path.
+UPSERT_RETURNING_DIALECTS = {"sqlite"}
+
+
+def insert_or_update(dialect_name: str, table, conflict_columns: list, update_values):
+    """Build a native ``INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE`` for ``table``.
+
+    ``update_values`` receives the row that failed to insert (``excluded`` on
+    SQLite, ``inserted`` on MariaDB/MySQL) and returns the column assignments
+    to apply to the existing row. ``conflict_columns`` must be covered by a
+    primary key or unique index; MariaDB infers it from the key itself.
+    """
+    if dialect_name == "sqlite":
+        stmt = sqlite_insert(table)
+        return stmt.on_conflict_do_update(index_elements=conflict_columns, set_=update_values(stmt.excluded))
+    if dialect_name in {"mysql", "mariadb"}:
+        stmt = mysql_insert(table)
+        return stmt.on_duplicate_key_update(**update_values(stmt.inserted))
+    raise NotImplementedError(f"Upsert is not supported for the {dialect_name} dialect")
@@ -1,17 +1,60 @@
-from fastapi import FastAPI
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+
+from app.api import auth, ems, exports
+from app.core.attendance_journal import attendance_journal
+from app.core.database import SessionLocal, dispose_engines, get_engine, replica_router
+from app.core.instrumentation import QueryStatsMiddleware
+from app.core.metrics import MetricsMiddleware, mark_process_dead, render_metrics
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.security import PasswordHasherBusy, shutdown_hash_pool
+
+logger = logging.getLogger(__name__)
+
+# Schema changes and demo data are opt-in so that importing the app, extra
+# workers and test runs never touch the database before they need it.
+RUN_MIGRATIONS_ON_STARTUP = os.getenv("RUN_MIGRATIONS_ON_STARTUP", "false").lower() == "true"
+SEED_DEMO_DATA = os.getenv("SEED_DEMO_DATA", "false").lower() == "true"
+
+
+def _prepare_database() -> None:
+    if RUN_MIGRATIONS_ON_STARTUP:
+        from app.core.migrations import run_migrations
 
-from app.api import auth, ems
-from app.core.database import Base, SessionLocal, engine
-from app.core.seed import seed_initial_data
-import app.models  # noqa: F401
+        applied = run_migrations(get_engine())
+        if applied:
+            logger.info("Applied migrations: %s", ", ".join(applied))
+    if SEED_DEMO_DATA:
+        from app.core.seed import seed_initial_data
 
-app = FastAPI(title="Employee Management System API")
+        with SessionLocal() as db:
+            seed_initial_data(db)
 
-Base.metadata.create_all(bind=engine)
 
-with SessionLocal() as db:
-    seed_initial_data(db)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    if RUN_MIGRATIONS_ON_STARTUP or SEED_DEMO_DATA:
+        await run_in_threadpool(_prepare_database)
+    await attendance_journal.start()
+    await replica_router.start()
+    logger.info("Startup completed in %.0f ms", (time.perf_counter() - started) * 1000)
+    yield
+    await replica_router.stop()
+    await attendance_journal.stop()
+    shutdown_hash_pool()
+    await dispose_engines()
+    mark_process_dead()
+
+
+app = FastAPI(title="Employee Management System API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,12 +62,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Server-Timing", "ETag"],
 )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth.router)
 app.include_router(ems.router)
+app.include_router(exports.router)
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
 
 
 @app.get("/")
 def healthcheck():
     return {"message": "Employee Management System API is running"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
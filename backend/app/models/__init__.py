@@ -2,16 +2,22 @@ from app.models.attendance import Attendance
 from app.models.employee import Employee
 from app.models.holiday import CompanyHoliday
 from app.models.leave import LeaveRequest
+from app.models.leave_balance import LeaveBalance
 from app.models.project import Project
 from app.models.project_member import ProjectMember
+from app.models.table_version import TableVersion
 from app.models.time_log import TimeLog
+from app.models.time_log_summary import TimeLogDailySummary
 
 __all__ = [
     "Attendance",
     "CompanyHoliday",
     "Employee",
+    "LeaveBalance",
     "LeaveRequest",
     "Project",
     "ProjectMember",
+    "TableVersion",
     "TimeLog",
+    "TimeLogDailySummary",
 ]
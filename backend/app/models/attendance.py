@@ -1,6 +1,6 @@
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -8,9 +8,10 @@ from app.core.database import Base
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (Index("uq_attendance_employee_work_date", "employee_id", "work_date", unique=True),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"), index=True)
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"))
     work_date: Mapped[date] = mapped_column(Date, index=True)
     status: Mapped[str] = mapped_column(String(30), default="present")
     check_in: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Date, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Date, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.core.database import Base
@@ -6,6 +6,7 @@ from app.core.database import Base
 
 class Employee(Base):
     __tablename__ = "employees"
+    __table_args__ = (Index("ix_employees_full_name_id", "full_name", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
@@ -14,7 +15,7 @@ class Employee(Base):
     title: Mapped[str] = mapped_column(String(100), default="Employee")
     department: Mapped[str] = mapped_column(String(100), default="General")
     role: Mapped[str] = mapped_column(String(50), default="employee")
-    manager_id: Mapped[int | None] = mapped_column(ForeignKey("employees.id"), nullable=True)
+    manager_id: Mapped[int | None] = mapped_column(ForeignKey("employees.id"), nullable=True, index=True)
     joined_on: Mapped[Date] = mapped_column(Date)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
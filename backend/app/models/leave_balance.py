@@ -0,0 +1,13 @@
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class LeaveBalance(Base):
+    __tablename__ = "leave_balances"
+
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"), primary_key=True)
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    used_days: Mapped[int] = mapped_column(Integer, default=0)
+    pending_days: Mapped[int] = mapped_column(Integer, default=0)
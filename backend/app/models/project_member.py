@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Integer
+from sqlalchemy import ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -6,8 +6,9 @@ from app.core.database import Base
 
 class ProjectMember(Base):
     __tablename__ = "project_members"
+    __table_args__ = (Index("ix_project_members_employee_project", "employee_id", "project_id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), index=True)
-    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"), index=True)
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"))
     allocation_percent: Mapped[int] = mapped_column(Integer, default=100)
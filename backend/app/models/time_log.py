@@ -1,6 +1,6 @@
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -8,9 +8,10 @@ from app.core.database import Base
 
 class TimeLog(Base):
     __tablename__ = "time_logs"
+    __table_args__ = (Index("ix_time_logs_employee_date_created", "employee_id", "work_date", "created_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"), index=True)
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"))
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), index=True)
     work_date: Mapped[date] = mapped_column(Date, index=True)
     hours: Mapped[float] = mapped_column(Float)
@@ -0,0 +1,16 @@
+from datetime import date
+
+from sqlalchemy import Date, Float, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class TimeLogDailySummary(Base):
+    __tablename__ = "time_log_daily_summaries"
+
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"), primary_key=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), primary_key=True, index=True)
+    work_date: Mapped[date] = mapped_column(Date, primary_key=True, index=True)
+    total_hours: Mapped[float] = mapped_column(Float, default=0)
+    entry_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -1,5 +1,7 @@
-from datetime import date
-from pydantic import BaseModel, Field
+from datetime import date, datetime
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class EmployeeCreate(BaseModel):
@@ -26,8 +28,7 @@ class EmployeeOut(BaseModel):
     role: str
     manager_id: int | None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class LoginResponse(BaseModel):
@@ -76,6 +77,10 @@ class TimeLogCreate(BaseModel):
     description: str
 
 
+class TimeLogBatchCreate(BaseModel):
+    entries: list[TimeLogCreate] = Field(min_length=1, max_length=200)
+
+
 class AdminEmployeeCreate(BaseModel):
     email: str
     password: str = Field(min_length=6)
@@ -87,6 +92,10 @@ class AdminEmployeeCreate(BaseModel):
     is_active: bool = True
 
 
+class EmployeeImportRow(AdminEmployeeCreate):
+    manager_email: str | None = None
+
+
 class AdminEmployeeUpdate(BaseModel):
     full_name: str | None = None
     title: str | None = None
@@ -103,3 +112,246 @@ class AdminLeaveCreate(BaseModel):
     start_date: date
     end_date: date
     status: str = "approved"
+
+
+# Response schemas. Declaring them on every route keeps internal columns such as
+# ``password_hash`` out of responses and lets FastAPI serialize straight to JSON
+# bytes in pydantic-core instead of going through ``jsonable_encoder``.
+
+
+class AdminEmployeeOut(EmployeeOut):
+    joined_on: date
+    is_active: bool
+
+
+class EmployeeLabelOut(BaseModel):
+    id: int
+    name: str
+    title: str
+    department: str
+
+
+class TeamMemberOut(EmployeeLabelOut):
+    manager: str | None
+    depth: int | None
+
+
+class ProfileOut(BaseModel):
+    id: int
+    email: str
+    full_name: str
+    title: str
+    department: str
+    role: str
+    joined_on: date
+    manager: str | None
+
+
+class EmployeeImportError(BaseModel):
+    row: int
+    email: str | None
+    detail: str
+
+
+class EmployeeImportResult(BaseModel):
+    created: int
+    failed: int
+    errors: list[EmployeeImportError]
+
+
+class CacheStatsOut(BaseModel):
+    size: int
+    maxsize: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+
+
+class DiagnosticsOut(BaseModel):
+    principal_cache: CacheStatsOut
+    dashboard_cache: CacheStatsOut
+    database_pool: dict[str, Any]
+    replicas: list[dict[str, Any]]
+
+
+class AttendanceOut(BaseModel):
+    id: int | None
+    employee_id: int
+    work_date: date
+    status: str
+    check_in: datetime | None
+    check_out: datetime | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LeaveRequestOut(BaseModel):
+    id: int
+    employee_id: int
+    reason: str
+    status: str
+    start_date: date
+    end_date: date
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LeaveBalanceOut(BaseModel):
+    employee_id: int
+    year: int
+    as_of: date
+    annual_allowance: float
+    entitled: float
+    accrued: float
+    used: int
+    pending: int
+    available: float
+
+
+class LeaveSummaryOut(BaseModel):
+    leave_id: int
+    employee: str
+    reason: str
+    start_date: date
+    end_date: date
+
+
+class LeaveListItemOut(LeaveSummaryOut):
+    employee_id: int
+    status: str
+
+
+class CalendarEntryOut(BaseModel):
+    employee_id: int
+    employee: str
+    department: str
+    leave_id: int
+
+
+class CalendarDayOut(BaseModel):
+    date: date
+    holiday: str | None
+    out: list[CalendarEntryOut]
+
+
+class HolidayOut(BaseModel):
+    id: int
+    name: str
+    holiday_date: date
+    description: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProjectOut(BaseModel):
+    id: int
+    code: str
+    name: str
+    description: str
+    status: str
+    start_date: date
+    end_date: date | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProjectMemberSummaryOut(BaseModel):
+    employee_id: int
+    employee_name: str
+    allocation_percent: int
+
+
+class ProjectWithMembersOut(ProjectOut):
+    members: list[ProjectMemberSummaryOut]
+
+
+class ProjectMemberOut(BaseModel):
+    id: int
+    project_id: int
+    employee_id: int
+    allocation_percent: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DashboardEmployeeOut(BaseModel):
+    id: int
+    name: str
+    title: str
+    department: str
+    role: str
+
+
+class DashboardOut(BaseModel):
+    employee: DashboardEmployeeOut
+    today_leaves: list[LeaveSummaryOut]
+    upcoming_leaves: list[LeaveSummaryOut]
+    upcoming_holidays: list[HolidayOut]
+    my_projects: list[ProjectOut]
+
+
+class TimeLogOut(BaseModel):
+    id: int
+    employee_id: int
+    project_id: int
+    work_date: date
+    hours: float
+    description: str
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TimeLogListItemOut(BaseModel):
+    id: int
+    project: str
+    project_code: str
+    work_date: date
+    hours: float
+    description: str
+    created_at: datetime
+
+
+class TimeLogBatchItemResult(BaseModel):
+    index: int
+    status: str
+    detail: str | None
+
+
+class TimeLogBatchResult(BaseModel):
+    created: int
+    rejected: int
+    results: list[TimeLogBatchItemResult]
+
+
+class HoursReportRow(BaseModel):
+    """One bucket of ``/reports/hours``; only the keys for the chosen ``group_by`` are set."""
+
+    project_id: int | None = None
+    project_code: str | None = None
+    project: str | None = None
+    employee_id: int | None = None
+    employee: str | None = None
+    department: str | None = None
+    week: str | None = None
+    week_start: date | None = None
+    total_hours: float
+    entry_count: int
+
+
+class SearchHitOut(BaseModel):
+    """One ``/search`` match; employee hits set the label keys, time-log hits the log keys."""
+
+    type: str
+    id: int
+    rank: float
+    name: str | None = None
+    title: str | None = None
+    department: str | None = None
+    employee_id: int | None = None
+    employee: str | None = None
+    project_code: str | None = None
+    work_date: date | None = None
+    hours: float | None = None
+    description: str | None = None
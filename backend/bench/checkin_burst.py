@@ -0,0 +1,116 @@
+"""9:00 AM check-in burst against a generated SQLite dataset.
+
+Run from ``backend/`` after ``pip install -r requirements-dev.txt``::
+
+    python -m bench.checkin_burst --scale 10000 --concurrency 16 --taps 2 --output checkin-burst.json
+
+Every employee checks in for today within one burst, each tapping ``--taps``
+times back to back the way a flaky mobile connection does, so duplicate
+requests for the same ``(employee_id, work_date)`` are in flight together.
+After the lifespan ends (which also flushes the write-behind journal when
+``--write-behind`` is set) the run checks that exactly one attendance row per
+employee exists for today and exits non-zero otherwise.
+
+SQLite admits one writer at a time, so the latencies here are a ceiling for
+the upsert path rather than what MariaDB delivers; past a couple of dozen concurrent
+writers SQLite's busy timeout starts failing requests with "database is locked".
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+
+async def _burst(args, employee_ids: list[int]) -> dict:
+    import httpx
+
+    from app.core.security import create_access_token
+    from app.main import app, lifespan
+    from bench.dataset import employee_email
+    from bench.load import _hammer
+
+    headers = {
+        employee_id: {"Authorization": f"Bearer {create_access_token({'sub': employee_email(employee_id)})}"}
+        for employee_id in employee_ids
+    }
+
+    def tap(index: int):
+        # Consecutive requests belong to the same employee so their taps overlap.
+        employee_id = employee_ids[index // args.taps]
+        return "POST", "/ems/attendance/check-in", {"json": {"status": "present"}, "headers": headers[employee_id]}
+
+    async with lifespan(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            return await _hammer(client, tap, len(employee_ids) * args.taps, args.concurrency)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate the morning check-in burst")
+    parser.add_argument("--scale", type=int, default=1000, help="Number of employees")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--taps", type=int, default=2, help="Check-in requests per employee")
+    parser.add_argument("--write-behind", action="store_true", help="Enable ATTENDANCE_WRITE_BEHIND")
+    parser.add_argument("--database", help="Reuse or create this SQLite file instead of a temporary one")
+    parser.add_argument("--output", default="checkin-burst.json")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory()
+    database = Path(args.database or Path(workdir.name) / "bench.db").resolve()
+    reuse = database.exists()
+
+    # The app reads its configuration at import, so point it at the dataset first.
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ["ALLOW_DATABASE_FALLBACK"] = "false"
+    os.environ["RUN_MIGRATIONS_ON_STARTUP"] = "false"
+    os.environ["SEED_DEMO_DATA"] = "false"
+    os.environ["ATTENDANCE_WRITE_BEHIND"] = "true" if args.write_behind else "false"
+
+    from sqlalchemy import delete, func, select
+
+    from app.core.database import get_engine
+    from app.models.attendance import Attendance
+    from bench.dataset import generate
+    from bench.load import _git_revision
+
+    engine = get_engine()
+    if not reuse:
+        print(f"Generated dataset: {generate(engine, args.scale, days=1, seed=args.seed)}", file=sys.stderr)
+    today = date.today()
+    with engine.begin() as conn:
+        conn.execute(delete(Attendance).where(Attendance.work_date == today))
+
+    employee_ids = list(range(1, args.scale + 1))
+    result = asyncio.run(_burst(args, employee_ids))
+
+    with engine.connect() as conn:
+        rows, employees = conn.execute(
+            select(func.count(), func.count(func.distinct(Attendance.employee_id))).where(
+                Attendance.work_date == today
+            )
+        ).one()
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "scale": args.scale,
+            "taps": args.taps,
+            "concurrency": args.concurrency,
+            "write_behind": args.write_behind,
+        },
+        "check_in": result,
+        "attendance_rows": rows,
+        "employees_checked_in": employees,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    print(json.dumps(report, indent=2))
+    workdir.cleanup()
+    if result["errors"] or rows != len(employee_ids) or employees != len(employee_ids):
+        sys.exit("check-in burst failed: expected one attendance row per employee and no errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Throughput as concurrent clients grow, async request path versus a sync one.
+
+Run from ``backend/`` after ``pip install -r requirements-dev.txt``::
+
+    python -m bench.concurrency --scale 10000 --levels 1 4 16 64 --requests 2000 --output concurrency.json
+
+``GET /ems/holidays`` is served by the real async router. For comparison the
+run mounts ``GET /bench/sync/holidays``, shaped like the handlers before the
+async migration: a ``def`` endpoint with a sync ``Session`` dependency and a
+sync principal lookup and the same statements, so each request holds an AnyIO worker thread (40 by
+default) for its whole database work. Both return the same first page. The
+principal cache is disabled so both paths do the same lookups; at each
+``--levels`` concurrency the report lists requests per second and p50/p99.
+
+Past the worker-thread count the sync path can stall until ``DB_POOL_TIMEOUT``
+while threads wait on each other for pooled connections; such requests are
+reported as errors (500s) rather than aborting the run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+
+def _sync_reference_router():
+    from fastapi import APIRouter, Depends, HTTPException
+    from sqlalchemy import select
+
+    from app.core.database import SessionLocal
+    from app.core.dependencies import security
+    from app.core.security import decode_access_token
+    from app.models.employee import Employee
+    from app.models.holiday import CompanyHoliday
+    from app.models.table_version import TableVersion
+    from app.schemas import HolidayOut
+
+    router = APIRouter(prefix="/bench/sync")
+
+    def get_sync_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def get_sync_employee(credentials=Depends(security), db=Depends(get_sync_db)):
+        try:
+            email = decode_access_token(credentials.credentials)["sub"]
+        except (AttributeError, KeyError, ValueError):
+            raise HTTPException(status_code=401, detail="Invalid token")
+        employee = db.scalar(select(Employee).where(Employee.email == email, Employee.is_active == True))
+        if not employee:
+            raise HTTPException(status_code=401, detail="Employee not found or inactive")
+        return employee
+
+    @router.get("/holidays", response_model=list[HolidayOut])
+    def list_holidays(employee=Depends(get_sync_employee), db=Depends(get_sync_db)):
+        # Same statements as the async route: the ETag version lookup, then the page.
+        db.scalar(select(TableVersion.version).where(TableVersion.name == "holidays"))
+        return db.scalars(
+            select(CompanyHoliday).order_by(CompanyHoliday.holiday_date, CompanyHoliday.id).limit(100)
+        ).all()
+
+    return router
+
+
+async def _run(args) -> dict:
+    import httpx
+
+    from app.core.security import create_access_token
+    from app.main import app, lifespan
+    from bench.dataset import employee_email
+    from bench.load import _hammer
+
+    app.include_router(_sync_reference_router())
+    headers = [
+        {"Authorization": f"Bearer {create_access_token({'sub': employee_email(employee_id)})}"}
+        for employee_id in range(1, min(args.scale, 256) + 1)
+    ]
+    paths = {"async": "/ems/holidays", "sync": "/bench/sync/holidays"}
+
+    results = {mode: {} for mode in paths}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with lifespan(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for concurrency in args.levels:
+                for mode, path in paths.items():
+
+                    def request(index: int, path=path):
+                        return "GET", path, {"headers": headers[index % len(headers)]}
+
+                    await client.request(*request(0)[:2], **request(0)[2])
+                    results[mode][str(concurrency)] = await _hammer(client, request, args.requests, concurrency)
+                    print(f"{mode} x{concurrency}: {results[mode][str(concurrency)]}", file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare async and sync request paths as concurrency grows")
+    parser.add_argument("--scale", type=int, default=10000, help="Number of employees")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 64], help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per path and level")
+    parser.add_argument("--database", help="Reuse or create this SQLite file instead of a temporary one")
+    parser.add_argument("--output", default="concurrency.json")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory()
+    database = Path(args.database or Path(workdir.name) / "bench.db").resolve()
+    reuse = database.exists()
+
+    # The app reads its configuration at import, so point it at the dataset first.
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ["ALLOW_DATABASE_FALLBACK"] = "false"
+    os.environ["RUN_MIGRATIONS_ON_STARTUP"] = "false"
+    os.environ["SEED_DEMO_DATA"] = "false"
+    os.environ["PRINCIPAL_CACHE_SIZE"] = "0"
+
+    from app.core.database import get_engine
+    from bench.dataset import generate
+    from bench.load import _git_revision
+
+    engine = get_engine()
+    if not reuse:
+        print(f"Generated dataset: {generate(engine, args.scale, days=1, seed=args.seed)}", file=sys.stderr)
+
+    report = {
+        "meta": {"revision": _git_revision(), "scale": args.scale, "requests": args.requests},
+        "throughput": asyncio.run(_run(args)),
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    print(json.dumps(report, indent=2))
+    workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
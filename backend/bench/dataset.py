@@ -0,0 +1,231 @@
+"""Deterministic synthetic dataset for load tests.
+
+``--scale`` is the number of employees; everything else grows with it: one
+project per 20 employees, one manager per 10, three leave requests each, and
+one attendance row plus one time log per employee per working day over
+``--days`` days. The same ``--seed``, ``--scale``, ``--days`` and ``--anchor``
+always produce the same rows.
+
+Run from ``backend/``::
+
+    python -m bench.dataset --database ./bench.db --scale 10000
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.leave_balance import rebuild_leave_balances
+from app.core.migrations import run_migrations
+from app.core.rollups import rebuild_daily_summaries
+from app.core.security import hash_password
+from app.models.attendance import Attendance
+from app.models.employee import Employee
+from app.models.holiday import CompanyHoliday
+from app.models.leave import LeaveRequest
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.time_log import TimeLog
+
+BENCH_PASSWORD = "bench-password"
+ADMIN_EMAIL = "admin@bench.local"
+INSERT_CHUNK_SIZE = 10000
+EMPLOYEES_PER_MANAGER = 10
+EMPLOYEES_PER_PROJECT = 20
+LEAVES_PER_EMPLOYEE = 3
+HOLIDAYS = 10
+
+DEPARTMENTS = ["Engineering", "Operations", "HR", "Finance", "Sales", "Support", "Marketing", "Design"]
+TITLES = ["Engineer", "Analyst", "Specialist", "Associate", "Consultant"]
+LEAVE_STATUSES = ["approved", "approved", "pending", "rejected"]
+
+
+def employee_email(employee_id: int) -> str:
+    return ADMIN_EMAIL if employee_id == 1 else f"employee{employee_id}@bench.local"
+
+
+def is_manager(employee_id: int) -> bool:
+    return employee_id % EMPLOYEES_PER_MANAGER == 2
+
+
+def _manager_of(employee_id: int) -> int | None:
+    if employee_id == 1:
+        return None
+    if is_manager(employee_id):
+        return 1
+    return (employee_id - 2) // EMPLOYEES_PER_MANAGER * EMPLOYEES_PER_MANAGER + 2
+
+
+def _working_days(anchor: date, days: int) -> list[date]:
+    window = (anchor - timedelta(days=offset) for offset in range(1, days + 1))
+    return [day for day in window if day.weekday() < 5]
+
+
+def _insert_chunks(conn: Connection, table, rows) -> int:
+    total = 0
+    rows = iter(rows)
+    while chunk := list(islice(rows, INSERT_CHUNK_SIZE)):
+        conn.execute(insert(table), chunk)
+        total += len(chunk)
+    return total
+
+
+def _employees(scale: int, anchor: date, password_hash: str, rng: random.Random):
+    for employee_id in range(1, scale + 1):
+        role = "admin" if employee_id == 1 else "manager" if is_manager(employee_id) else "employee"
+        yield {
+            "id": employee_id,
+            "email": employee_email(employee_id),
+            "password_hash": password_hash,
+            "full_name": f"Employee {employee_id:07d}",
+            "title": rng.choice(TITLES),
+            "department": rng.choice(DEPARTMENTS),
+            "role": role,
+            "manager_id": _manager_of(employee_id),
+            "joined_on": anchor - timedelta(days=rng.randint(30, 3650)),
+            "is_active": True,
+        }
+
+
+def _memberships(scale: int, projects: int, rng: random.Random):
+    member_id = 0
+    for employee_id in range(1, scale + 1):
+        for project_id in sorted(rng.sample(range(1, projects + 1), min(projects, rng.randint(1, 2)))):
+            member_id += 1
+            yield {
+                "id": member_id,
+                "project_id": project_id,
+                "employee_id": employee_id,
+                "allocation_percent": rng.choice([50, 100]),
+            }
+
+
+def _leaves(scale: int, anchor: date, rng: random.Random):
+    for employee_id in range(1, scale + 1):
+        for _ in range(LEAVES_PER_EMPLOYEE):
+            start = anchor + timedelta(days=rng.randint(-60, 60))
+            yield {
+                "employee_id": employee_id,
+                "reason": "Synthetic leave",
+                "status": rng.choice(LEAVE_STATUSES),
+                "start_date": start,
+                "end_date": start + timedelta(days=rng.randint(0, 4)),
+                "created_at": datetime.combine(start, datetime.min.time()) - timedelta(days=rng.randint(1, 30)),
+            }
+
+
+def _attendance(scale: int, work_days: list[date], rng: random.Random):
+    for employee_id in range(1, scale + 1):
+        for work_date in work_days:
+            check_in = datetime.combine(work_date, datetime.min.time()) + timedelta(minutes=rng.randint(480, 600))
+            yield {
+                "employee_id": employee_id,
+                "work_date": work_date,
+                "status": rng.choice(["present", "present", "present", "remote"]),
+                "check_in": check_in,
+                "check_out": check_in + timedelta(minutes=rng.randint(420, 600)),
+            }
+
+
+def _time_logs(work_days: list[date], projects_by_employee: dict[int, list[int]], rng: random.Random):
+    for employee_id, project_ids in projects_by_employee.items():
+        for work_date in work_days:
+            yield {
+                "employee_id": employee_id,
+                "project_id": rng.choice(project_ids),
+                "work_date": work_date,
+                "hours": rng.choice([4.0, 6.0, 7.5, 8.0, 9.0]),
+                "description": "Synthetic work",
+                "created_at": datetime.combine(work_date, datetime.min.time()) + timedelta(hours=18),
+            }
+
+
+def generate(engine: Engine, scale: int, days: int = 30, seed: int = 42, anchor: date | None = None) -> dict:
+    """Create the schema on ``engine`` and fill it; returns row counts and timings."""
+    anchor = anchor or date.today()
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    run_migrations(engine)
+
+    projects = max(1, scale // EMPLOYEES_PER_PROJECT)
+    work_days = _working_days(anchor, days)
+    counts = {}
+    with engine.begin() as conn:
+        counts["employees"] = _insert_chunks(
+            conn, Employee.__table__, _employees(scale, anchor, hash_password(BENCH_PASSWORD), rng)
+        )
+        counts["projects"] = _insert_chunks(
+            conn,
+            Project.__table__,
+            (
+                {
+                    "id": project_id,
+                    "code": f"PRJ-{project_id:05d}",
+                    "name": f"Project {project_id:05d}",
+                    "description": "Synthetic project",
+                    "status": "active",
+                    "start_date": anchor - timedelta(days=365),
+                    "end_date": None,
+                }
+                for project_id in range(1, projects + 1)
+            ),
+        )
+
+        projects_by_employee: dict[int, list[int]] = {}
+
+        def memberships():
+            for member in _memberships(scale, projects, rng):
+                projects_by_employee.setdefault(member["employee_id"], []).append(member["project_id"])
+                yield member
+
+        counts["project_members"] = _insert_chunks(conn, ProjectMember.__table__, memberships())
+        counts["company_holidays"] = _insert_chunks(
+            conn,
+            CompanyHoliday.__table__,
+            (
+                {
+                    "name": f"Holiday {index + 1}",
+                    "holiday_date": anchor + timedelta(days=index * 30 - 90),
+                    "description": "Synthetic holiday",
+                }
+                for index in range(HOLIDAYS)
+            ),
+        )
+        counts["leave_requests"] = _insert_chunks(conn, LeaveRequest.__table__, _leaves(scale, anchor, rng))
+        counts["attendance"] = _insert_chunks(conn, Attendance.__table__, _attendance(scale, work_days, rng))
+        counts["time_logs"] = _insert_chunks(
+            conn, TimeLog.__table__, _time_logs(work_days, projects_by_employee, rng)
+        )
+        counts["time_log_daily_summaries"] = rebuild_daily_summaries(conn)
+        counts["leave_balances"] = rebuild_leave_balances(conn)
+
+    return {
+        "scale": scale,
+        "days": days,
+        "seed": seed,
+        "anchor": anchor.isoformat(),
+        "rows": counts,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic EMS dataset")
+    parser.add_argument("--database", required=True, help="SQLite file to create")
+    parser.add_argument("--scale", type=int, default=1000, help="Number of employees")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor", type=date.fromisoformat, default=None, help="Last day of data (default today)")
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.database}")
+    print(json.dumps(generate(engine, args.scale, args.days, args.seed, args.anchor), indent=2))
+
+
+if __name__ == "__main__":
+    main()
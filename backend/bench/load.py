@@ -0,0 +1,172 @@
+"""Load test that drives the real routers against a generated SQLite dataset.
+
+Run from ``backend/`` after ``pip install -r requirements-dev.txt``::
+
+    python -m bench.load --scale 10000 --concurrency 32 --requests 500 --output bench-results.json
+
+The app runs in-process behind an ASGI transport with its normal lifespan, so
+routing, dependencies, middleware and serialization are all exercised; only
+the network hop is skipped. Each endpoint is hammered on its own for
+``--requests`` requests by ``--concurrency`` workers. The JSON written to
+``--output`` holds p50/p95/p99 latency and requests per second per endpoint,
+plus the dataset shape, so runs from different commits can be diffed.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+    }
+
+
+async def _hammer(client, make_request, total: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    issued = 0
+
+    async def worker():
+        nonlocal errors, issued
+        while issued < total:
+            index = issued
+            issued += 1
+            method, url, kwargs = make_request(index)
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return _summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def _run(args, dataset: dict) -> dict:
+    import httpx
+
+    from app.core.security import create_access_token
+    from app.main import app, lifespan
+    from bench.dataset import ADMIN_EMAIL, BENCH_PASSWORD, employee_email, is_manager
+
+    scale = dataset["scale"]
+    rng = random.Random(args.seed)
+    employee_ids = [employee_id for employee_id in range(2, scale + 1) if not is_manager(employee_id)] or [1]
+    sample = [rng.choice(employee_ids) for _ in range(min(len(employee_ids), 256))]
+
+    def bearer(employee_id: int, role: str) -> dict:
+        token = create_access_token({"sub": employee_email(employee_id), "role": role, "employee_id": employee_id})
+        return {"Authorization": f"Bearer {token}"}
+
+    employee_headers = [bearer(employee_id, "employee") for employee_id in sample]
+    admin_headers = bearer(1, "admin")
+
+    scenarios = {
+        "POST /auth/login": lambda i: (
+            "POST",
+            "/auth/login",
+            {"json": {"email": employee_email(sample[i % len(sample)]), "password": BENCH_PASSWORD}},
+        ),
+        "GET /ems/dashboard": lambda i: ("GET", "/ems/dashboard", {"headers": employee_headers[i % len(sample)]}),
+        "GET /ems/projects": lambda i: ("GET", "/ems/projects", {"headers": employee_headers[i % len(sample)]}),
+        "GET /ems/leaves/all": lambda i: ("GET", "/ems/leaves/all", {"headers": admin_headers}),
+        "GET /ems/time-logs": lambda i: ("GET", "/ems/time-logs", {"headers": employee_headers[i % len(sample)]}),
+        # Type-ahead on the zero-padded employee number: each prefix matches about a hundred names.
+        "GET /ems/search": lambda i: (
+            "GET",
+            "/ems/search",
+            {"params": {"q": f"{sample[i % len(sample)]:07d}"[:5]}, "headers": employee_headers[i % len(sample)]},
+        ),
+    }
+    if args.endpoints:
+        scenarios = {name: scenario for name, scenario in scenarios.items() if name in args.endpoints}
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with lifespan(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, make_request in scenarios.items():
+                # One untimed request per endpoint warms caches and the connection pool.
+                await client.request(*make_request(0)[:2], **make_request(0)[2])
+                results[name] = await _hammer(client, make_request, args.requests, args.concurrency)
+                print(f"{name}: {results[name]}", file=sys.stderr)
+
+    return {
+        "meta": {
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "concurrency": args.concurrency,
+            "requests_per_endpoint": args.requests,
+            "admin": ADMIN_EMAIL,
+        },
+        "dataset": dataset,
+        "endpoints": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the EMS API against a synthetic SQLite dataset")
+    parser.add_argument("--scale", type=int, default=1000, help="Number of employees")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--database", help="Reuse or create this SQLite file instead of a temporary one")
+    parser.add_argument("--endpoints", nargs="*", help='Only run these, e.g. "GET /ems/projects"')
+    parser.add_argument("--output", default="bench-results.json")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory()
+    database = Path(args.database or Path(workdir.name) / "bench.db").resolve()
+    reuse = database.exists()
+
+    # The app reads its configuration at import, so point it at the dataset first.
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ["ALLOW_DATABASE_FALLBACK"] = "false"
+    os.environ["RUN_MIGRATIONS_ON_STARTUP"] = "false"
+    os.environ["SEED_DEMO_DATA"] = "false"
+
+    from app.core.database import get_engine
+    from bench.dataset import generate
+
+    if reuse:
+        dataset = {"scale": args.scale, "reused": str(database)}
+    else:
+        dataset = generate(get_engine(), args.scale, args.days, args.seed)
+        print(f"Generated dataset: {dataset}", file=sys.stderr)
+
+    report = asyncio.run(_run(args, dataset))
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    print(json.dumps(report["endpoints"], indent=2))
+    workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Login throughput and p99 while read traffic keeps flowing.
+
+Run from ``backend/`` after ``pip install -r requirements-dev.txt``::
+
+    python -m bench.login_burst --scale 2000 --logins 400 --login-concurrency 32 --output login-burst.json
+
+The dataset's passwords are hashed with the configured ``PASSWORD_ITERATIONS``,
+so each login pays the real PBKDF2 cost in the ``PASSWORD_HASH_WORKERS``
+process pool. The run first measures ``GET /ems/holidays`` alone, then again
+while a shift-start burst of ``POST /auth/login`` runs alongside it. The report
+holds both read summaries and the login summary; logins turned away with 503
+by ``PASSWORD_HASH_QUEUE_LIMIT`` count as errors. Reads should barely move
+while logins queue for the pool.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+
+async def _run(args) -> dict:
+    import httpx
+
+    from app.core.security import PASSWORD_HASH_WORKERS, PASSWORD_ITERATIONS, create_access_token
+    from app.main import app, lifespan
+    from bench.dataset import BENCH_PASSWORD, employee_email
+    from bench.load import _hammer
+
+    rng = random.Random(args.seed)
+    sample = [rng.randint(1, args.scale) for _ in range(256)]
+    read_headers = [
+        {"Authorization": f"Bearer {create_access_token({'sub': employee_email(employee_id)})}"}
+        for employee_id in sample
+    ]
+
+    def read(index: int):
+        return "GET", "/ems/holidays", {"headers": read_headers[index % len(sample)]}
+
+    def login(index: int):
+        email = employee_email(sample[index % len(sample)])
+        return "POST", "/auth/login", {"json": {"email": email, "password": BENCH_PASSWORD}}
+
+    async with lifespan(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            # Warm the principal cache and the hashing pool before timing anything.
+            for index in range(len(sample)):
+                await client.request(*read(index)[:2], **read(index)[2])
+            await client.request(*login(0)[:2], **login(0)[2])
+
+            reads_alone = await _hammer(client, read, args.reads, args.read_concurrency)
+            logins, reads_during_logins = await asyncio.gather(
+                _hammer(client, login, args.logins, args.login_concurrency),
+                _hammer(client, read, args.reads, args.read_concurrency),
+            )
+    return {
+        "password_iterations": PASSWORD_ITERATIONS,
+        "password_hash_workers": PASSWORD_HASH_WORKERS,
+        "reads_alone": reads_alone,
+        "reads_during_logins": reads_during_logins,
+        "logins": logins,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure logins and reads during a login burst")
+    parser.add_argument("--scale", type=int, default=2000, help="Number of employees")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--login-concurrency", type=int, default=32)
+    parser.add_argument("--reads", type=int, default=2000, help="Read requests per phase")
+    parser.add_argument("--read-concurrency", type=int, default=8)
+    parser.add_argument("--database", help="Reuse or create this SQLite file instead of a temporary one")
+    parser.add_argument("--output", default="login-burst.json")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory()
+    database = Path(args.database or Path(workdir.name) / "bench.db").resolve()
+    reuse = database.exists()
+
+    # The app reads its configuration at import, so point it at the dataset first.
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ["ALLOW_DATABASE_FALLBACK"] = "false"
+    os.environ["RUN_MIGRATIONS_ON_STARTUP"] = "false"
+    os.environ["SEED_DEMO_DATA"] = "false"
+
+    from app.core.database import get_engine
+    from bench.dataset import generate
+    from bench.load import _git_revision
+
+    if not reuse:
+        print(f"Generated dataset: {generate(get_engine(), args.scale, days=1, seed=args.seed)}", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "scale": args.scale,
+            "login_concurrency": args.login_concurrency,
+            "read_concurrency": args.read_concurrency,
+        },
+        **asyncio.run(_run(args)),
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    print(json.dumps(report, indent=2))
+    workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
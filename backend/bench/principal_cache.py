@@ -0,0 +1,126 @@
+"""Per-request latency with the principal cache on and off.
+
+Run from ``backend/`` after ``pip install -r requirements-dev.txt``::
+
+    python -m bench.principal_cache --scale 10000 --tokens 256 --requests 2000 --output principal-cache.json
+
+``PRINCIPAL_CACHE_SIZE`` is read at import, so each mode runs in its own
+interpreter against the same generated dataset: once with the configured cache
+and once with ``PRINCIPAL_CACHE_SIZE=0``. Both hammer ``GET /auth/me`` and
+``GET /ems/holidays``, cheap endpoints where authentication dominates, with
+``--tokens`` distinct employees' tokens, and report latency percentiles, SQL
+statements per request (from ``Server-Timing``) and the cache's hit/miss counters.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+QUERY_COUNT = re.compile(r'desc="(\d+) queries"')
+ENDPOINTS = ["/auth/me", "/ems/holidays"]
+
+
+async def _measure(args) -> dict:
+    import httpx
+
+    from app.core.dependencies import principal_cache
+    from app.core.security import create_access_token
+    from app.main import app, lifespan
+    from bench.dataset import employee_email
+    from bench.load import _hammer
+
+    rng = random.Random(args.seed)
+    employee_ids = rng.sample(range(1, args.scale + 1), min(args.tokens, args.scale))
+    headers = [
+        {"Authorization": f"Bearer {create_access_token({'sub': employee_email(employee_id)})}"}
+        for employee_id in employee_ids
+    ]
+
+    results = {}
+    async with lifespan(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for path in ENDPOINTS:
+
+                def request(index: int, path=path):
+                    return "GET", path, {"headers": headers[index % len(headers)]}
+
+                # Untimed pass: every token is seen once, so the cached run measures hits only.
+                for index in range(len(headers)):
+                    response = await client.request(*request(index)[:2], **request(index)[2])
+                queries = int(QUERY_COUNT.search(response.headers["server-timing"])[1])
+                results[f"GET {path}"] = {
+                    "queries_per_request": queries,
+                    **await _hammer(client, request, args.requests, args.concurrency),
+                }
+    return {"principal_cache": principal_cache.stats(), "endpoints": results}
+
+
+def _run_mode(args, database: Path, cache_size: str) -> dict:
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database}",
+        "ALLOW_DATABASE_FALLBACK": "false",
+        "RUN_MIGRATIONS_ON_STARTUP": "false",
+        "SEED_DEMO_DATA": "false",
+        "SQL_INSTRUMENTATION": "true",
+        "PRINCIPAL_CACHE_SIZE": cache_size,
+    }
+    command = [sys.executable, "-m", "bench.principal_cache", "--measure", *sys.argv[1:]]
+    output = subprocess.run(command, cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare request latency with the principal cache on and off")
+    parser.add_argument("--scale", type=int, default=10000, help="Number of employees")
+    parser.add_argument("--tokens", type=int, default=256, help="Distinct callers")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint and mode")
+    parser.add_argument("--database", help="Reuse or create this SQLite file instead of a temporary one")
+    parser.add_argument("--output", default="principal-cache.json")
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(asyncio.run(_measure(args))))
+        return
+
+    workdir = tempfile.TemporaryDirectory()
+    database = Path(args.database or Path(workdir.name) / "bench.db").resolve()
+    if not database.exists():
+        os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+        from app.core.database import get_engine
+        from bench.dataset import generate
+
+        print(f"Generated dataset: {generate(get_engine(), args.scale, days=1, seed=args.seed)}", file=sys.stderr)
+
+    from bench.load import _git_revision
+
+    # Honour a configured cache size for the "on" run, unless it is the disabled value.
+    cache_size = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000")) or 10000
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "scale": args.scale,
+            "tokens": args.tokens,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+        },
+        "cache_on": _run_mode(args, database, str(cache_size)),
+        "cache_off": _run_mode(args, database, "0"),
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    print(json.dumps(report, indent=2))
+    workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""SQL statements per ``GET /ems/projects`` page as the project count grows.
+
+Run from ``backend/`` after ``pip install -r requirements-dev.txt``::
+
+    python -m bench.project_queries --projects 50 500 5000 --limit 500 --output project-queries.json
+
+A small dataset is generated once, then projects (with ``--members`` members
+each) are added until each ``--projects`` target is reached. At every size the
+run walks all pages of ``/ems/projects`` as the admin and reads the statement
+count from the ``Server-Timing`` header of each response. Membership loading is
+batched per page, so the count per full page must be the same at every size;
+the run exits non-zero when it is not.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+QUERY_COUNT = re.compile(r'desc="(\d+) queries"')
+
+
+def _grow_projects(engine, target: int, members: int, scale: int, rng: random.Random) -> int:
+    from sqlalchemy import func, select
+
+    from app.models.project import Project
+    from app.models.project_member import ProjectMember
+    from bench.dataset import _insert_chunks
+
+    with engine.begin() as conn:
+        current = conn.scalar(select(func.max(Project.id))) or 0
+        next_member = (conn.scalar(select(func.max(ProjectMember.id))) or 0) + 1
+        new_ids = range(current + 1, target + 1)
+        _insert_chunks(
+            conn,
+            Project.__table__,
+            (
+                {
+                    "id": project_id,
+                    "code": f"PRJ-{project_id:05d}",
+                    "name": f"Project {project_id:05d}",
+                    "description": "Synthetic project",
+                    "status": "active",
+                    "start_date": date.today() - timedelta(days=365),
+                    "end_date": None,
+                }
+                for project_id in new_ids
+            ),
+        )
+        _insert_chunks(
+            conn,
+            ProjectMember.__table__,
+            (
+                {
+                    "id": next_member + offset * members + index,
+                    "project_id": project_id,
+                    "employee_id": employee_id,
+                    "allocation_percent": 100,
+                }
+                for offset, project_id in enumerate(new_ids)
+                for index, employee_id in enumerate(rng.sample(range(1, scale + 1), members))
+            ),
+        )
+        return conn.scalar(select(func.count(Project.id)))
+
+
+async def _walk_pages(client, headers: dict, limit: int) -> dict:
+    pages = []
+    params = {"limit": limit}
+    started = time.perf_counter()
+    while True:
+        response = await client.get("/ems/projects", params=params, headers=headers)
+        response.raise_for_status()
+        pages.append(
+            {"rows": len(response.json()), "queries": int(QUERY_COUNT.search(response.headers["server-timing"])[1])}
+        )
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+        params = {"limit": limit, "cursor": cursor}
+    elapsed = time.perf_counter() - started
+    full_pages = [page["queries"] for page in pages if page["rows"] == limit] or [pages[0]["queries"]]
+    return {
+        "pages": len(pages),
+        "queries_per_full_page": sorted(set(full_pages)),
+        "queries_total": sum(page["queries"] for page in pages),
+        "ms_per_page": round(elapsed * 1000 / len(pages), 3),
+    }
+
+
+async def _run(args, engine) -> dict:
+    import httpx
+
+    from app.core.security import create_access_token
+    from app.main import app, lifespan
+    from bench.dataset import ADMIN_EMAIL
+
+    rng = random.Random(args.seed)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': ADMIN_EMAIL})}"}
+    results = {}
+    async with lifespan(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            # Resolve the admin once so the principal lookup is not counted against the first page.
+            await client.get("/auth/me", headers=headers)
+            for target in sorted(args.projects):
+                projects = _grow_projects(engine, target, args.members, args.scale, rng)
+                results[str(projects)] = await _walk_pages(client, headers, args.limit)
+                print(f"{projects} projects: {results[str(projects)]}", file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Count SQL statements per /ems/projects page as projects grow")
+    parser.add_argument("--projects", type=int, nargs="+", default=[50, 500, 5000], help="Project counts to test")
+    parser.add_argument("--members", type=int, default=5, help="Members per added project")
+    parser.add_argument("--scale", type=int, default=1000, help="Number of employees")
+    parser.add_argument("--limit", type=int, default=500, help="Page size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="project-queries.json")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory()
+    database = Path(workdir.name) / "bench.db"
+
+    # The app reads its configuration at import, so point it at the dataset first.
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ["ALLOW_DATABASE_FALLBACK"] = "false"
+    os.environ["RUN_MIGRATIONS_ON_STARTUP"] = "false"
+    os.environ["SEED_DEMO_DATA"] = "false"
+    os.environ["SQL_INSTRUMENTATION"] = "true"
+
+    from app.core.database import get_engine
+    from bench.dataset import generate
+    from bench.load import _git_revision
+
+    engine = get_engine()
+    print(f"Generated dataset: {generate(engine, args.scale, days=1, seed=args.seed)}", file=sys.stderr)
+    results = asyncio.run(_run(args, engine))
+    counts = {count for result in results.values() for count in result["queries_per_full_page"]}
+    report = {
+        "meta": {"revision": _git_revision(), "scale": args.scale, "limit": args.limit, "members": args.members},
+        "projects": results,
+        "constant": len(counts) == 1,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    print(json.dumps(report, indent=2))
+    workdir.cleanup()
+    if not report["constant"]:
+        sys.exit(f"queries per page vary with the project count: {sorted(counts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compare response serialization strategies on a large attendance page.
+
+Run from ``backend/`` after ``pip install -r requirements-dev.txt``::
+
+    python -m bench.serialization --rows 10000 --repeat 20
+
+``jsonable_encoder`` is what FastAPI falls back to for routes without a
+response model; ``response_model`` is the pydantic-core JSON path the routes
+use now; ``response_model_orjson`` is what a custom orjson response class
+would do with the same model; ``orjson`` dumps unvalidated dicts.
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.models.attendance import Attendance
+from app.schemas import AttendanceOut
+
+
+def _rows(count: int) -> list[Attendance]:
+    start = date(2024, 1, 1)
+    rows = []
+    for index in range(count):
+        work_date = start + timedelta(days=index)
+        check_in = datetime.combine(work_date, datetime.min.time()) + timedelta(hours=9)
+        rows.append(
+            Attendance(
+                id=index + 1,
+                employee_id=1,
+                work_date=work_date,
+                status="present",
+                check_in=check_in,
+                check_out=check_in + timedelta(hours=8),
+            )
+        )
+    return rows
+
+
+def _time(func, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = _rows(args.rows)
+    adapter = TypeAdapter(list[AttendanceOut])
+    columns = Attendance.__table__.c.keys()
+
+    def jsonable():
+        return json.dumps(jsonable_encoder(rows)).encode("utf-8")
+
+    def response_model():
+        return adapter.dump_json(adapter.validate_python(rows))
+
+    def response_model_orjson():
+        return orjson.dumps(adapter.dump_python(adapter.validate_python(rows)))
+
+    def orjson_dicts():
+        return orjson.dumps([{column: getattr(row, column) for column in columns} for row in rows])
+
+    results = {
+        "rows": args.rows,
+        "jsonable_encoder": _time(jsonable, args.repeat),
+        "response_model": _time(response_model, args.repeat),
+        "response_model_orjson": _time(response_model_orjson, args.repeat),
+        "orjson": _time(orjson_dicts, args.repeat),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Cold-start budget for the API process.
+
+Run from ``backend/``::
+
+    python -m bench.startup --runs 5 --budget 1.0
+
+Each run imports ``app.main`` in a fresh interpreter pointed at a SQLite file
+that does not exist yet; the import must stay under the budget and must not
+create the file, i.e. it must not open a database connection. The lifespan
+(migrations and seeding when enabled) is timed separately. Exits non-zero when
+the budget is exceeded.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+IMPORT_PROBE = """
+import time
+started = time.perf_counter()
+import app.main
+print(time.perf_counter() - started)
+"""
+
+LIFESPAN_PROBE = """
+import asyncio, time
+from app.main import app, lifespan
+
+async def main():
+    started = time.perf_counter()
+    async with lifespan(app):
+        print(time.perf_counter() - started)
+
+asyncio.run(main())
+"""
+
+
+def _run(probe: str, env: dict) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=BACKEND_DIR,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=float(os.getenv("STARTUP_BUDGET_SECONDS", "1.0")))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database = Path(workdir) / "cold_start.db"
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{database}",
+            "ALLOW_DATABASE_FALLBACK": "false",
+            "RUN_MIGRATIONS_ON_STARTUP": "false",
+            "SEED_DEMO_DATA": "false",
+        }
+        imports = [_run(IMPORT_PROBE, env) for _ in range(args.runs)]
+        touched_database = database.exists()
+
+        env.update({"RUN_MIGRATIONS_ON_STARTUP": "true", "SEED_DEMO_DATA": "true"})
+        first_boot = _run(LIFESPAN_PROBE, env)
+        warm_boot = _run(LIFESPAN_PROBE, env)
+
+    median_import = statistics.median(imports)
+    report = {
+        "runs": args.runs,
+        "budget_seconds": args.budget,
+        "import_median_seconds": round(median_import, 3),
+        "import_max_seconds": round(max(imports), 3),
+        "import_opened_database": touched_database,
+        "lifespan_first_boot_seconds": round(first_boot, 3),
+        "lifespan_warm_boot_seconds": round(warm_boot, 3),
+    }
+    print(json.dumps(report, indent=2))
+    if median_import > args.budget or touched_database:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""``/ems/team`` against a deep synthetic org chart.
+
+Run from ``backend/`` after ``pip install -r requirements-dev.txt``::
+
+    python -m bench.team_hierarchy --scale 50000 --levels 8 --output team-hierarchy.json
+
+The generated dataset is reshaped into a complete tree with ``--levels``
+levels: employee ``k`` reports to ``(k - 2) // fan_out + 1``, with the
+smallest fan-out that fits ``--scale`` employees, and everyone with reports is
+a manager. For the first manager on each level the run times ``?depth=1``
+(direct reports) and ``?depth=<levels>`` (the whole subtree), and records how
+many employees each returned so regressions in either size or speed show up.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+
+def _fan_out(scale: int, levels: int) -> int:
+    fan_out = 2
+    while sum(fan_out**level for level in range(levels)) < scale:
+        fan_out += 1
+    return fan_out
+
+
+def _manager_of(employee_id: int, fan_out: int) -> int | None:
+    return None if employee_id == 1 else (employee_id - 2) // fan_out + 1
+
+
+def _first_on_level(level: int, fan_out: int) -> int:
+    """Id of the first employee ``level`` steps below the root."""
+    return sum(fan_out**step for step in range(level)) + 1
+
+
+def _reshape_org(engine, scale: int, fan_out: int) -> None:
+    from sqlalchemy import bindparam, update
+
+    from app.models.employee import Employee
+
+    table = Employee.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("employee_id"))
+        .values(manager_id=bindparam("new_manager_id"), role=bindparam("new_role"))
+    )
+    with engine.begin() as conn:
+        conn.execute(
+            stmt,
+            [
+                {
+                    "employee_id": employee_id,
+                    "new_manager_id": _manager_of(employee_id, fan_out),
+                    "new_role": "admin"
+                    if employee_id == 1
+                    else "manager"
+                    if (employee_id - 1) * fan_out + 2 <= scale
+                    else "employee",
+                }
+                for employee_id in range(1, scale + 1)
+            ],
+        )
+
+
+async def _run(args, managers: dict[int, int]) -> dict:
+    import httpx
+
+    from app.core.security import create_access_token
+    from app.main import app, lifespan
+    from bench.dataset import employee_email
+    from bench.load import _hammer
+
+    results = {}
+    async with lifespan(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for level, employee_id in managers.items():
+                headers = {"Authorization": f"Bearer {create_access_token({'sub': employee_email(employee_id)})}"}
+                for depth in sorted({1, args.levels}):
+
+                    def request(index: int, depth=depth, headers=headers):
+                        return "GET", "/ems/team", {"params": {"depth": depth}, "headers": headers}
+
+                    # One untimed request warms the principal cache and records the subtree size.
+                    size = len((await client.request(*request(0)[:2], **request(0)[2])).json())
+                    name = f"level {level} depth {depth}"
+                    results[name] = {
+                        "manager_id": employee_id,
+                        "team_size": size,
+                        **await _hammer(client, request, args.requests, args.concurrency),
+                    }
+                    print(f"{name}: {results[name]}", file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark /ems/team on a deep org chart")
+    parser.add_argument("--scale", type=int, default=50000, help="Number of employees")
+    parser.add_argument("--levels", type=int, default=8, help="Depth of the org chart, counting the root")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=50, help="Requests per manager and depth")
+    parser.add_argument("--database", help="Reuse or create this SQLite file instead of a temporary one")
+    parser.add_argument("--output", default="team-hierarchy.json")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory()
+    database = Path(args.database or Path(workdir.name) / "bench.db").resolve()
+    reuse = database.exists()
+
+    # The app reads its configuration at import, so point it at the dataset first.
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ["ALLOW_DATABASE_FALLBACK"] = "false"
+    os.environ["RUN_MIGRATIONS_ON_STARTUP"] = "false"
+    os.environ["SEED_DEMO_DATA"] = "false"
+
+    from app.core.database import get_engine
+    from bench.dataset import generate
+    from bench.load import _git_revision
+
+    engine = get_engine()
+    fan_out = _fan_out(args.scale, args.levels)
+    if not reuse:
+        print(f"Generated dataset: {generate(engine, args.scale, days=1, seed=args.seed)}", file=sys.stderr)
+    _reshape_org(engine, args.scale, fan_out)
+
+    # The root is the admin, who sees everyone without walking the tree; leaves have
+    # no reports. Time every level in between that still has managers.
+    managers = {
+        level: _first_on_level(level, fan_out)
+        for level in range(1, args.levels - 1)
+        if (_first_on_level(level, fan_out) - 1) * fan_out + 2 <= args.scale
+    }
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "scale": args.scale,
+            "levels": args.levels,
+            "fan_out": fan_out,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+        },
+        "team": asyncio.run(_run(args, managers)),
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    print(json.dumps(report, indent=2))
+    workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
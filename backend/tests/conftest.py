@@ -0,0 +1,71 @@
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+# The app reads its settings at import time, so point it at a throwaway database
+# before anything under ``app`` is imported.
+_TEST_DIR = Path(tempfile.mkdtemp(prefix="ems-tests-"))
+os.environ.update(
+    {
+        "DATABASE_URL": f"sqlite:///{_TEST_DIR / 'app.db'}",
+        "ALLOW_DATABASE_FALLBACK": "false",
+        "DATABASE_REPLICA_URLS": "",
+        "RUN_MIGRATIONS_ON_STARTUP": "false",
+        "SEED_DEMO_DATA": "false",
+        "PASSWORD_ITERATIONS": "1000",
+        "PASSWORD_HASH_WORKERS": "0",
+        "ATTENDANCE_WRITE_BEHIND": "false",
+    }
+)
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from app.core.migrations import run_migrations  # noqa: E402
+
+
+@pytest.fixture
+def migrated_engine(tmp_path):
+    """A sync engine on a fresh SQLite file with every migration applied."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'ems.db'}")
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def app_database():
+    """Migrate and seed the database the app itself is configured with."""
+    from app.core.database import SessionLocal, get_engine
+    from app.core.seed import seed_initial_data
+
+    engine = get_engine()
+    run_migrations(engine)
+    with SessionLocal() as db:
+        seed_initial_data(db)
+    return engine
+
+
+@asynccontextmanager
+async def _api_client():
+    import httpx
+
+    from app.main import app, lifespan
+
+    async with lifespan(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            yield client
+
+
+@pytest.fixture
+def api(app_database):
+    """Factory for an in-process async client over the app and its lifespan."""
+    return _api_client
+
+
+def bearer(email: str, role: str = "employee") -> dict:
+    from app.core.security import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token({'sub': email, 'role': role})}"}
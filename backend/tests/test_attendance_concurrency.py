@@ -0,0 +1,77 @@
+"""Concurrent check-ins for the same day must collapse into a single attendance row."""
+import asyncio
+from datetime import date
+
+from sqlalchemy import delete, func, select
+
+from app.models.attendance import Attendance
+from app.models.employee import Employee
+from tests.conftest import bearer
+
+EMAIL = "employee@company.com"
+CONCURRENT_TAPS = 25
+
+
+def _attendance_rows(engine, employee_id: int) -> list:
+    with engine.connect() as conn:
+        return conn.execute(
+            select(Attendance.check_in, Attendance.check_out).where(
+                Attendance.employee_id == employee_id, Attendance.work_date == date.today()
+            )
+        ).all()
+
+
+def test_concurrent_check_ins_create_one_row(app_database, api):
+    with app_database.begin() as conn:
+        employee_id = conn.scalar(select(Employee.id).where(Employee.email == EMAIL))
+        conn.execute(delete(Attendance).where(Attendance.employee_id == employee_id))
+    headers = bearer(EMAIL)
+
+    async def tap_many():
+        async with api() as client:
+            check_ins = await asyncio.gather(
+                *(
+                    client.post("/ems/attendance/check-in", json={"status": "present"}, headers=headers)
+                    for _ in range(CONCURRENT_TAPS)
+                )
+            )
+            check_outs = await asyncio.gather(
+                *(client.post("/ems/attendance/check-out", headers=headers) for _ in range(CONCURRENT_TAPS))
+            )
+            return check_ins, check_outs
+
+    check_ins, check_outs = asyncio.run(tap_many())
+
+    assert [response.status_code for response in check_ins + check_outs] == [200] * (2 * CONCURRENT_TAPS)
+    rows = _attendance_rows(app_database, employee_id)
+    assert len(rows) == 1
+    # Later taps must not move the first check-in.
+    assert {response.json()["check_in"] for response in check_ins} == {rows[0].check_in.isoformat()}
+    assert rows[0].check_out is not None
+
+
+def test_concurrent_upserts_for_many_employees(app_database, api):
+    with app_database.begin() as conn:
+        emails = conn.scalars(select(Employee.email).order_by(Employee.id)).all()
+        conn.execute(delete(Attendance).where(Attendance.work_date == date.today()))
+
+    async def burst():
+        async with api() as client:
+            return await asyncio.gather(
+                *(
+                    client.post("/ems/attendance/check-in", json={"status": "present"}, headers=bearer(email))
+                    for email in emails * 5
+                )
+            )
+
+    responses = asyncio.run(burst())
+
+    assert all(response.status_code == 200 for response in responses)
+    with app_database.connect() as conn:
+        per_employee = conn.execute(
+            select(Attendance.employee_id, func.count())
+            .where(Attendance.work_date == date.today())
+            .group_by(Attendance.employee_id)
+        ).all()
+    assert len(per_employee) == len(emails)
+    assert all(count == 1 for _, count in per_employee)
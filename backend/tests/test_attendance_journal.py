@@ -0,0 +1,154 @@
+"""Write-behind attendance: crash replay and reads and check-outs during a flush."""
+import asyncio
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app.core import attendance_journal as journal_module
+from app.core.attendance_journal import AttendanceJournal, _encode
+from app.core.database import get_async_engine
+from app.models.attendance import Attendance
+from app.models.employee import Employee
+from tests.conftest import bearer
+
+EMAIL = "employee@company.com"
+DAY = date(2031, 3, 3)
+
+
+@pytest.fixture
+def employee_ids(app_database):
+    with app_database.begin() as conn:
+        ids = conn.scalars(select(Employee.id).order_by(Employee.id)).all()
+        conn.execute(delete(Attendance).where(Attendance.work_date >= DAY))
+    yield ids
+    with app_database.begin() as conn:
+        conn.execute(delete(Attendance).where(Attendance.work_date >= DAY))
+
+
+def _rows(engine) -> dict:
+    with engine.connect() as conn:
+        return {
+            row.employee_id: row
+            for row in conn.execute(select(Attendance).where(Attendance.work_date == DAY))
+        }
+
+
+def _event(employee_id: int, **fields) -> dict:
+    return {"employee_id": employee_id, "work_date": DAY, **fields}
+
+
+def test_replay_of_partially_flushed_journal(app_database, employee_ids, tmp_path):
+    first, second, third = employee_ids[:3]
+    morning, later, evening = datetime(2031, 3, 3, 9), datetime(2031, 3, 3, 10), datetime(2031, 3, 3, 18)
+
+    # The crash hit after the first batch committed but before its journal was deleted.
+    with app_database.begin() as conn:
+        conn.execute(insert(Attendance), [{**_event(first), "status": "present", "check_in": morning}])
+    journal_path = tmp_path / "attendance.journal"
+    (tmp_path / "attendance.journal.flushing").write_text(
+        _encode(_event(first, status="present", check_in=morning))
+        + "\n"
+        + _encode(_event(second, status="present", check_in=morning))
+        + "\n"
+    )
+    journal_path.write_text(
+        _encode(_event(first, status="remote", check_in=later))
+        + "\n"
+        + _encode(_event(second, check_out=evening))
+        + "\n"
+        + _encode(_event(third, status="present", check_in=later))
+        + "\n"
+        + '{"employee_id": 1, "work_da'
+    )
+    journal = AttendanceJournal(str(journal_path), enabled=True, flush_interval=3600, batch_size=2)
+
+    async def restart():
+        try:
+            await journal.start()
+            await journal.stop()
+        finally:
+            await get_async_engine().dispose()
+
+    asyncio.run(restart())
+
+    rows = _rows(app_database)
+    assert set(rows) == {first, second, third}
+    assert (rows[first].check_in, rows[first].status) == (morning, "remote")
+    assert (rows[second].check_in, rows[second].check_out) == (morning, evening)
+    assert rows[third].check_in == later
+    assert not journal_path.exists() and not journal.flushing_path.exists()
+    assert journal.pending_for(first) == {}
+
+
+def test_check_out_while_flush_is_running(app_database, employee_ids, api, tmp_path, monkeypatch):
+    journal = journal_module.attendance_journal
+    monkeypatch.setattr(journal, "enabled", True)
+    monkeypatch.setattr(journal, "flush_interval", 3600)
+    monkeypatch.setattr(journal, "path", tmp_path / "attendance.journal")
+    monkeypatch.setattr(journal, "flushing_path", tmp_path / "attendance.journal.flushing")
+
+    class Today(date):
+        @classmethod
+        def today(cls):
+            return DAY
+
+    monkeypatch.setattr("app.api.ems.date", Today)
+    headers = bearer(EMAIL)
+    release = asyncio.Event()
+    write = journal._write
+
+    async def slow_write(states):
+        await release.wait()
+        await write(states)
+
+    monkeypatch.setattr(journal, "_write", slow_write)
+
+    async def scenario():
+        async with api() as client:
+            checked_in = await client.post("/ems/attendance/check-in", json={"status": "present"}, headers=headers)
+            flushing = asyncio.create_task(journal.flush())
+            await asyncio.sleep(0.05)
+            assert journal.flushing_path.exists()
+            history = await client.get("/ems/attendance", params={"from": DAY.isoformat()}, headers=headers)
+            checked_out = await client.post("/ems/attendance/check-out", headers=headers)
+            release.set()
+            await flushing
+            return checked_in, history, checked_out
+
+    checked_in, history, checked_out = asyncio.run(scenario())
+
+    assert checked_in.status_code == 200
+    assert [row["work_date"] for row in history.json()] == [DAY.isoformat()]
+    assert checked_out.status_code == 200, checked_out.text
+    assert checked_out.json()["check_in"] == checked_in.json()["check_in"]
+    employee_id = checked_in.json()["employee_id"]
+    row = _rows(app_database)[employee_id]
+    assert row.check_in is not None and row.check_out is not None
+
+
+def test_failed_flush_keeps_events_pending(app_database, employee_ids, tmp_path, monkeypatch):
+    journal_path = tmp_path / "attendance.journal"
+    journal = AttendanceJournal(str(journal_path), enabled=True, flush_interval=3600, batch_size=10)
+    employee_id = employee_ids[0]
+    journal.record(_event(employee_id, status="present", check_in=datetime(2031, 3, 3, 9)))
+
+    async def failing_write(states):
+        journal.record(_event(employee_id, check_out=datetime(2031, 3, 3, 18)))
+        raise RuntimeError("database went away")
+
+    async def flush_twice():
+        monkeypatch.setattr(journal, "_write", failing_write)
+        with pytest.raises(RuntimeError):
+            await journal.flush()
+        assert journal.pending_for(employee_id)[DAY]["check_out"] == datetime(2031, 3, 3, 18)
+        monkeypatch.undo()
+        try:
+            return await journal.flush()
+        finally:
+            await get_async_engine().dispose()
+
+    assert asyncio.run(flush_twice()) == 1
+    row = _rows(app_database)[employee_id]
+    assert (row.check_in, row.check_out) == (datetime(2031, 3, 3, 9), datetime(2031, 3, 3, 18))
+    assert journal.pending_for(employee_id) == {}
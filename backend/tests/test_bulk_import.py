@@ -0,0 +1,68 @@
+"""A failing insert must be pinned to its row, and its reports must not be stored without a manager."""
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app.api import ems
+from app.models.employee import Employee
+from tests.conftest import bearer
+
+DOMAIN = "@bulk-import.test"
+CSV = f"""email,password,full_name,role,manager_email
+boss{DOMAIN},secret1,Boss,manager,
+report{DOMAIN},secret1,Report,employee,boss{DOMAIN}
+racer{DOMAIN},secret1,Racer,manager,
+orphan{DOMAIN},secret1,Orphan,employee,racer{DOMAIN}
+"""
+
+
+@pytest.fixture
+def cleanup(app_database):
+    yield
+    with app_database.begin() as conn:
+        conn.execute(delete(Employee).where(Employee.email.like(f"%{DOMAIN}")))
+
+
+def test_conflicting_row_is_reported_and_its_reports_rejected(app_database, api, cleanup, monkeypatch):
+    hash_passwords = ems.hash_passwords_async
+
+    async def hash_while_another_import_lands(passwords):
+        # Another request creates one of the emails after this import checked for it.
+        with app_database.begin() as conn:
+            conn.execute(
+                insert(Employee).values(
+                    email=f"racer{DOMAIN}", password_hash="x", full_name="Racer", joined_on=date.today()
+                )
+            )
+        return await hash_passwords(passwords)
+
+    monkeypatch.setattr(ems, "hash_passwords_async", hash_while_another_import_lands)
+
+    async def upload():
+        async with api() as client:
+            return await client.post(
+                "/ems/admin/employees/bulk",
+                headers=bearer("admin@company.com", "admin"),
+                files={"file": ("employees.csv", CSV, "text/csv")},
+            )
+
+    response = asyncio.run(upload())
+
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["created"] == 2
+    errors = {error["row"]: error for error in result["errors"]}
+    assert sorted(errors) == [3, 4]
+    assert errors[3]["email"] == f"racer{DOMAIN}"
+    assert errors[3]["detail"].startswith("Insert failed")
+    assert errors[4]["detail"] == "Manager in row 3 was not created"
+
+    with app_database.connect() as conn:
+        stored = dict(
+            conn.execute(select(Employee.email, Employee.id).where(Employee.email.like(f"%{DOMAIN}"))).all()
+        )
+        report_manager = conn.scalar(select(Employee.manager_id).where(Employee.email == f"report{DOMAIN}"))
+    assert set(stored) == {f"boss{DOMAIN}", f"report{DOMAIN}", f"racer{DOMAIN}"}
+    assert report_manager == stored[f"boss{DOMAIN}"]
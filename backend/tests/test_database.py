@@ -0,0 +1,17 @@
+"""Shutdown must close the engines that exist without building the ones that do not."""
+import asyncio
+
+from app.core import database
+
+
+def test_dispose_engines_skips_engines_never_built(monkeypatch):
+    monkeypatch.setattr(database, "_async_engine", None)
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database.replica_router, "urls", ["sqlite:///unused-replica.db"])
+    monkeypatch.setattr(database.replica_router, "_engines", None)
+
+    asyncio.run(database.dispose_engines())
+
+    assert database._async_engine is None
+    assert database._engine is None
+    assert database.replica_router._engines is None
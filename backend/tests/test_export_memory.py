@@ -0,0 +1,78 @@
+"""Streaming exports must hold one cursor batch in memory, not the whole result."""
+import asyncio
+import tracemalloc
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app.api import exports
+from app.core.database import get_async_engine
+from app.core.dependencies import CurrentEmployee
+from app.core.pagination import DateRange
+from app.models.attendance import Attendance
+from app.models.employee import Employee
+
+EMAIL = "analyst@company.com"
+# Far enough in the past not to meet the rows other tests write for today.
+FIRST_DAY = date(1880, 1, 1)
+LARGE_EXPORT_ROWS = 50_000
+SMALL_EXPORT_ROWS = 1_000
+BATCH_SIZE = 500
+
+
+@pytest.fixture
+def attendance_history(app_database):
+    with app_database.begin() as conn:
+        employee = conn.execute(select(Employee).where(Employee.email == EMAIL)).one()
+        conn.execute(
+            insert(Attendance),
+            [
+                {"employee_id": employee.id, "work_date": FIRST_DAY + timedelta(days=offset), "status": "present"}
+                for offset in range(LARGE_EXPORT_ROWS)
+            ],
+        )
+    yield employee
+    with app_database.begin() as conn:
+        conn.execute(
+            delete(Attendance).where(
+                Attendance.employee_id == employee.id,
+                Attendance.work_date < FIRST_DAY + timedelta(days=LARGE_EXPORT_ROWS),
+            )
+        )
+
+
+def _export_peak(admin: CurrentEmployee, rows: int) -> tuple[int, int]:
+    """Drain an attendance export of ``rows`` rows; returns (lines, peak traced bytes)."""
+
+    async def drain():
+        period = DateRange(start=FIRST_DAY, end=FIRST_DAY + timedelta(days=rows - 1))
+        response = await exports.export_attendance(
+            export_format="csv", gzip=False, department=None, period=period, current_employee=admin
+        )
+        lines = 0
+        tracemalloc.start()
+        try:
+            async for chunk in response.body_iterator:
+                lines += chunk.count(b"\n")
+            return lines, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            await get_async_engine().dispose()
+
+    return asyncio.run(drain())
+
+
+def test_export_peak_memory_is_flat(attendance_history, monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", BATCH_SIZE)
+    admin = CurrentEmployee.from_model(attendance_history)
+    admin = CurrentEmployee(**{**admin.__dict__, "role": "admin"})
+
+    # Warm statement and connection caches so the first measurement is not inflated.
+    _export_peak(admin, BATCH_SIZE)
+    small_lines, small_peak = _export_peak(admin, SMALL_EXPORT_ROWS)
+    large_lines, large_peak = _export_peak(admin, LARGE_EXPORT_ROWS)
+
+    assert (small_lines, large_lines) == (SMALL_EXPORT_ROWS + 1, LARGE_EXPORT_ROWS + 1)
+    # 50x the rows may not cost more than a small constant factor of the small export's peak.
+    assert large_peak < small_peak * 2, (small_peak, large_peak)
@@ -0,0 +1,23 @@
+"""Query timing must not leak start times across statements on a pooled connection."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.instrumentation import QueryStats, _current_stats, instrument_engine
+
+
+def test_failed_statement_does_not_leave_a_start_time(migrated_engine):
+    instrument_engine(migrated_engine)
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        with migrated_engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+            assert conn.info["query_started"] == []
+
+            conn.execute(text("SELECT 1"))
+            assert conn.info["query_started"] == []
+    finally:
+        _current_stats.reset(token)
+    assert stats.count == 1
@@ -0,0 +1,101 @@
+"""Leave balances must not be overspent by concurrent requests and must give days back when they stop counting."""
+import asyncio
+
+import pytest
+from sqlalchemy import delete, extract, select, update
+
+from app.models.employee import Employee
+from app.models.holiday import CompanyHoliday
+from app.models.leave import LeaveRequest
+from app.models.leave_balance import LeaveBalance
+from app.models.table_version import TableVersion
+from tests.conftest import bearer
+
+EMAIL = "employee@company.com"
+# Far enough ahead that the full allowance (20 days) has accrued by the end of the leave.
+YEAR = 2099
+# Tuesday 1 to Monday 21 December: 15 working days, so two of them never fit.
+LEAVE = {"reason": "Winter break", "start_date": "2099-12-01", "end_date": "2099-12-21"}
+LEAVE_DAYS = 15
+CONCURRENT_REQUESTS = 8
+
+
+@pytest.fixture
+def employee_id(app_database):
+    with app_database.connect() as conn:
+        employee_id = conn.scalar(select(Employee.id).where(Employee.email == EMAIL))
+    yield employee_id
+    with app_database.begin() as conn:
+        conn.execute(
+            delete(LeaveRequest).where(
+                LeaveRequest.employee_id == employee_id, extract("year", LeaveRequest.start_date) == YEAR
+            )
+        )
+        conn.execute(delete(LeaveBalance).where(LeaveBalance.employee_id == employee_id, LeaveBalance.year == YEAR))
+        conn.execute(delete(CompanyHoliday).where(extract("year", CompanyHoliday.holiday_date) == YEAR))
+        # Drop cached working calendars that still hold the deleted holidays.
+        conn.execute(
+            update(TableVersion).where(TableVersion.name == "holidays").values(version=TableVersion.version + 1)
+        )
+
+
+def _balance(client, headers: dict):
+    return client.get("/ems/leaves/balance", params={"year": YEAR}, headers=headers)
+
+
+async def _used_and_pending(client, headers: dict) -> tuple:
+    body = (await _balance(client, headers)).json()
+    return body["used"], body["pending"]
+
+
+def test_concurrent_requests_cannot_overspend(employee_id, api):
+    headers = bearer(EMAIL)
+
+    async def apply_many():
+        async with api() as client:
+            responses = await asyncio.gather(
+                *(client.post("/ems/leaves", json=LEAVE, headers=headers) for _ in range(CONCURRENT_REQUESTS))
+            )
+            return responses, await _used_and_pending(client, headers)
+
+    responses, balance = asyncio.run(apply_many())
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200] + [400] * (CONCURRENT_REQUESTS - 1), [response.text for response in responses]
+    assert balance == (0, LEAVE_DAYS)
+
+
+def test_approve_then_reject_refunds_the_days(employee_id, api):
+    headers = bearer(EMAIL)
+    lead = bearer("lead@company.com", "manager")
+
+    async def review():
+        async with api() as client:
+            leave_id = (await client.post("/ems/leaves", json=LEAVE, headers=headers)).json()["id"]
+            balances = [await _used_and_pending(client, headers)]
+            for status in ("approved", "rejected", "approved"):
+                response = await client.put(f"/ems/leaves/{leave_id}", json={"status": status}, headers=lead)
+                assert response.status_code == 200, response.text
+                balances.append(await _used_and_pending(client, headers))
+            return balances
+
+    assert asyncio.run(review()) == [(0, LEAVE_DAYS), (LEAVE_DAYS, 0), (0, 0), (LEAVE_DAYS, 0)]
+
+
+def test_new_holiday_refunds_booked_leave(employee_id, api):
+    headers = bearer(EMAIL)
+    admin = bearer("admin@company.com", "admin")
+
+    async def add_holiday():
+        async with api() as client:
+            leave_id = (await client.post("/ems/leaves", json=LEAVE, headers=headers)).json()["id"]
+            await client.put(f"/ems/leaves/{leave_id}", json={"status": "approved"}, headers=admin)
+            before = await _used_and_pending(client, headers)
+            holiday = {"name": "Company day", "holiday_date": "2099-12-02"}
+            assert (await client.post("/ems/holidays", json=holiday, headers=admin)).status_code == 200
+            return before, await _used_and_pending(client, headers)
+
+    before, after = asyncio.run(add_holiday())
+
+    assert before == (LEAVE_DAYS, 0)
+    assert after == (LEAVE_DAYS - 1, 0)
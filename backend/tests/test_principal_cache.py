@@ -0,0 +1,77 @@
+"""Cached principals must not outlive a change made by any worker."""
+import asyncio
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core.dependencies import PRINCIPALS_VERSION, CurrentEmployee, principal_cache
+from app.core.upsert import insert_or_update
+from app.models.employee import Employee
+from app.models.table_version import TableVersion
+from tests.conftest import bearer
+
+EMAIL = "analyst@company.com"
+
+
+@pytest.fixture
+def analyst(app_database):
+    with app_database.connect() as conn:
+        employee = conn.execute(select(Employee).where(Employee.email == EMAIL)).one()
+    yield employee
+    with app_database.begin() as conn:
+        conn.execute(update(Employee).where(Employee.id == employee.id).values(role=employee.role, is_active=True))
+    principal_cache.clear()
+
+
+def _change_elsewhere(engine, employee_id: int, **values) -> None:
+    """Update the employee the way another worker would: same transaction bumps the stamp."""
+    table = TableVersion.__table__
+    with engine.begin() as conn:
+        conn.execute(update(Employee).where(Employee.id == employee_id).values(**values))
+        conn.execute(
+            insert_or_update(engine.dialect.name, table, ["name"], lambda new: {"version": table.c.version + 1}),
+            [{"name": PRINCIPALS_VERSION, "version": 1}],
+        )
+
+
+def _get(api, path: str, headers: dict):
+    async def call():
+        async with api() as client:
+            return await client.get(path, headers=headers)
+
+    return asyncio.run(call())
+
+
+def test_deactivation_on_another_worker_revokes_cached_principal(app_database, analyst, api):
+    headers = bearer(EMAIL)
+    assert _get(api, "/auth/me", headers).status_code == 200
+    assert principal_cache.stats()["size"] >= 1
+
+    _change_elsewhere(app_database, analyst.id, is_active=False)
+
+    assert _get(api, "/auth/me", headers).status_code == 401
+
+
+def test_demotion_on_another_worker_is_seen_by_cached_principal(app_database, analyst, api):
+    headers = bearer(EMAIL)
+    _change_elsewhere(app_database, analyst.id, role="admin")
+    assert _get(api, "/ems/admin/employees", headers).status_code == 200
+
+    _change_elsewhere(app_database, analyst.id, role="employee")
+
+    assert _get(api, "/ems/admin/employees", headers).status_code == 403
+
+
+def test_entry_stored_under_an_old_stamp_is_not_served(app_database, analyst, api):
+    # A request that read the employee before a concurrent update committed caches
+    # the old row; it carries the stamp from before the update, so it is ignored.
+    headers = bearer(EMAIL)
+    with app_database.connect() as conn:
+        version = conn.scalar(select(TableVersion.version).where(TableVersion.name == PRINCIPALS_VERSION)) or 0
+        row = conn.execute(select(Employee.__table__).where(Employee.id == analyst.id)).mappings().one()
+    fields = {field: row[field] for field in CurrentEmployee.__dataclass_fields__}
+    stale = CurrentEmployee(**{**fields, "role": "admin"})
+    _change_elsewhere(app_database, analyst.id, role="employee")
+    principal_cache.set(headers["Authorization"].split()[1], (version, stale))
+
+    assert _get(api, "/ems/admin/employees", headers).status_code == 403
@@ -0,0 +1,156 @@
+"""The hot lookups and keyset lists must be served by the composite indexes from 0002."""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, inspect, select, text
+
+from app.api.ems import _approved_leaves_overlapping
+from app.core.pagination import keyset_filter
+from app.models.attendance import Attendance
+from app.models.employee import Employee
+from app.models.leave import LeaveRequest
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.time_log import TimeLog
+
+EMPLOYEE_ID = 42
+DAY = date(2026, 3, 2)
+
+HOT_QUERIES = {
+    "attendance by employee and date": (
+        select(Attendance).where(Attendance.employee_id == EMPLOYEE_ID, Attendance.work_date == DAY),
+        "uq_attendance_employee_work_date",
+    ),
+    "attendance history by employee": (
+        select(Attendance)
+        .where(Attendance.employee_id == EMPLOYEE_ID, Attendance.work_date >= DAY)
+        .order_by(Attendance.work_date.desc(), Attendance.id.desc()),
+        "uq_attendance_employee_work_date",
+    ),
+    "time logs by employee and date": (
+        select(TimeLog.work_date, func.sum(TimeLog.hours))
+        .where(TimeLog.employee_id == EMPLOYEE_ID, TimeLog.work_date.in_([DAY]))
+        .group_by(TimeLog.work_date),
+        "ix_time_logs_employee_date_created",
+    ),
+    "time log history by employee": (
+        select(TimeLog)
+        .where(TimeLog.employee_id == EMPLOYEE_ID, TimeLog.work_date >= DAY)
+        .order_by(TimeLog.work_date.desc(), TimeLog.created_at.desc(), TimeLog.id.desc()),
+        "ix_time_logs_employee_date_created",
+    ),
+    "projects by member": (
+        select(Project)
+        .join(ProjectMember, ProjectMember.project_id == Project.id)
+        .where(ProjectMember.employee_id == EMPLOYEE_ID),
+        "ix_project_members_employee_project",
+    ),
+    "dashboard leaves overlapping today": (
+        _approved_leaves_overlapping(DAY, DAY),
+        "ix_leave_requests_status_start_end",
+    ),
+    "dashboard upcoming leaves": (
+        select(LeaveRequest)
+        .where(
+            LeaveRequest.status == "approved",
+            LeaveRequest.start_date > DAY,
+            LeaveRequest.start_date <= DAY + timedelta(days=14),
+        )
+        .order_by(LeaveRequest.start_date.asc()),
+        "ix_leave_requests_status_start_end",
+    ),
+    "leave calendar overlapping a month": (
+        _approved_leaves_overlapping(DAY, DAY + timedelta(days=30)),
+        "ix_leave_requests_status_start_end",
+    ),
+    "leaves by employee": (
+        select(LeaveRequest)
+        .where(LeaveRequest.employee_id == EMPLOYEE_ID)
+        .order_by(LeaveRequest.created_at.desc()),
+        "ix_leave_requests_employee_created",
+    ),
+}
+
+
+def _keyset_page(stmt, columns: list, cursor: list | None = None, descending: bool = False):
+    """The statement ``paginate`` runs for one page."""
+    if cursor is not None:
+        stmt = stmt.where(keyset_filter(columns, cursor, descending))
+    return stmt.order_by(*(column.desc() if descending else column.asc() for column in columns)).limit(101)
+
+
+ALL_LEAVES = select(LeaveRequest, Employee).join(Employee, LeaveRequest.employee_id == Employee.id)
+LEAVE_ORDER = [LeaveRequest.start_date, LeaveRequest.id]
+
+# Paginated lists must walk the index in order; a sort step means every page reads the whole table.
+KEYSET_QUERIES = {
+    "all leaves, first page": (
+        _keyset_page(ALL_LEAVES, LEAVE_ORDER, descending=True),
+        "ix_leave_requests_start_date_id",
+    ),
+    "all leaves, next page": (
+        _keyset_page(ALL_LEAVES, LEAVE_ORDER, [DAY, 500], descending=True),
+        "ix_leave_requests_start_date_id",
+    ),
+    "all leaves in a period": (
+        _keyset_page(
+            ALL_LEAVES.where(LeaveRequest.end_date >= DAY, LeaveRequest.start_date <= DAY + timedelta(days=30)),
+            LEAVE_ORDER,
+            descending=True,
+        ),
+        "ix_leave_requests_start_date_id",
+    ),
+    "employees, first page": (
+        _keyset_page(select(Employee), [Employee.full_name, Employee.id]),
+        "ix_employees_full_name_id",
+    ),
+    "employees, next page": (
+        _keyset_page(select(Employee), [Employee.full_name, Employee.id], ["Employee 0000500", 500]),
+        "ix_employees_full_name_id",
+    ),
+    "projects, first page": (
+        _keyset_page(select(Project), [Project.name, Project.id]),
+        "ix_projects_name_id",
+    ),
+    "projects, next page": (
+        _keyset_page(select(Project), [Project.name, Project.id], ["Project 00050", 50]),
+        "ix_projects_name_id",
+    ),
+}
+
+
+def _query_plan(conn, stmt) -> str:
+    sql = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    return "\n".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_composite_index(migrated_engine, name):
+    stmt, index_name = HOT_QUERIES[name]
+    with migrated_engine.connect() as conn:
+        plan = _query_plan(conn, stmt)
+    assert f"INDEX {index_name}" in plan, plan
+
+
+@pytest.mark.parametrize("name", KEYSET_QUERIES)
+def test_keyset_list_walks_its_index(migrated_engine, name):
+    stmt, index_name = KEYSET_QUERIES[name]
+    with migrated_engine.connect() as conn:
+        plan = _query_plan(conn, stmt)
+    assert f"INDEX {index_name}" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.parametrize(
+    "table_name, index_name",
+    [
+        ("attendance", "ix_attendance_employee_id"),
+        ("time_logs", "ix_time_logs_employee_id"),
+        ("project_members", "ix_project_members_employee_id"),
+        ("leave_requests", "ix_leave_requests_employee_id"),
+    ],
+)
+def test_redundant_employee_indexes_are_dropped(migrated_engine, table_name, index_name):
+    with migrated_engine.connect() as conn:
+        names = {index["name"] for index in inspect(conn).get_indexes(table_name)}
+    assert index_name not in names